@@ -7,6 +7,8 @@ import pygame
 import os
 import time
 
+import metrics
+
 class AudioManager:
     def __init__(self):
         """Initialize the audio manager"""
@@ -24,6 +26,7 @@ class AudioManager:
             self.audio_available = True
             print("Audio system initialized successfully")
         except pygame.error as e:
+            self.failed('init')
             print(f"Audio system initialization failed: {e}")
             print("Game will run without sound")
             return
@@ -34,6 +37,12 @@ class AudioManager:
         # Load sound effects
         self.load_sounds()
     
+    def failed(self, operation):
+        """Count an audio call that raised pygame.error"""
+        metrics.registry.counter('forest_runner_audio_failures_total',
+                                 "Audio calls that raised pygame.error",
+                                 {'operation': operation}).inc()
+    
     def load_music(self):
         """Load background music from the audio directory"""
         if not self.audio_available:
@@ -69,6 +78,7 @@ class AudioManager:
                 self.sounds['jump'].set_volume(self.sound_volume)
                 print(f"Jump sound loaded: {jump_path}")
             except pygame.error as e:
+                self.failed('load_sound')
                 print(f"Could not load jump sound: {e}")
         
         # Load game over sound
@@ -79,6 +89,7 @@ class AudioManager:
                 self.sounds['game_over'].set_volume(self.sound_volume)
                 print(f"Game over sound loaded: {game_over_path}")
             except pygame.error as e:
+                self.failed('load_sound')
                 print(f"Could not load game over sound: {e}")
     
     def play_music(self):
@@ -92,6 +103,7 @@ class AudioManager:
             pygame.mixer.music.play(-1)  # -1 means loop indefinitely
             print("Background music started")
         except pygame.error as e:
+            self.failed('play_music')
             print(f"Could not play background music: {e}")
     
     def stop_music(self):
@@ -103,6 +115,7 @@ class AudioManager:
             pygame.mixer.music.stop()
             print("Background music stopped")
         except pygame.error as e:
+            self.failed('stop_music')
             print(f"Error stopping music: {e}")
     
     def pause_music(self):
@@ -113,7 +126,7 @@ class AudioManager:
         try:
             pygame.mixer.music.pause()
         except pygame.error:
-            pass
+            self.failed('pause_music')
     
     def unpause_music(self):
         """Unpause the background music"""
@@ -123,7 +136,7 @@ class AudioManager:
         try:
             pygame.mixer.music.unpause()
         except pygame.error:
-            pass
+            self.failed('unpause_music')
     
     def play_sound(self, sound_name):
         """Play a sound effect by name"""
@@ -134,7 +147,7 @@ class AudioManager:
             try:
                 self.sounds[sound_name].play()
             except pygame.error:
-                pass
+                self.failed('play_sound')
     
     def toggle_music(self):
         """Toggle background music on/off"""
@@ -158,6 +171,18 @@ class AudioManager:
         self.sound_enabled = not self.sound_enabled
         return self.sound_enabled
     
+    def shutdown(self):
+        """Release the mixer and turn all audio calls into no-ops (used by headless runs)"""
+        if not self.audio_available:
+            return
+            
+        try:
+            pygame.mixer.quit()
+        except pygame.error:
+            pass
+        self.sounds = {}
+        self.audio_available = False
+    
     def set_music_volume(self, volume):
         """Set music volume (0.0 to 1.0)"""
         if not self.audio_available:
@@ -167,7 +192,7 @@ class AudioManager:
         try:
             pygame.mixer.music.set_volume(self.music_volume)
         except pygame.error:
-            pass
+            self.failed('set_volume')
     
     def set_sound_volume(self, volume):
         """Set sound effects volume (0.0 to 1.0)"""
@@ -180,7 +205,7 @@ class AudioManager:
             try:
                 sound.set_volume(self.sound_volume)
             except pygame.error:
-                pass
+                self.failed('set_volume')
 
 # Create a global instance for easy importing
 audio_manager = None
@@ -0,0 +1,215 @@
+"""
+Bot Harness for Forest Runner
+Plays seeded headless games with scripted jump policies across a process pool
+and aggregates score histograms, death causes and throughput
+
+Example:
+    python bot_harness.py --runs 20000 --distance 20 40 60 --start-speed 5 7
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import os
+import random
+import sys
+import time
+
+import headless
+
+# Result of one headless game
+RunResult = collections.namedtuple('RunResult', 'seed distance start_speed score frames death_cause')
+
+# Per-process game instance, created by init_worker
+_game = None
+
+
+class JumpWhenClose:
+    """Jump as soon as the nearest obstacle ahead is closer than `distance` pixels"""
+
+    def __init__(self, distance):
+        self.distance = distance
+
+    def __call__(self, game):
+        nearest = game.next_obstacle()
+        return nearest is not None and nearest[0] < self.distance
+
+
+def init_worker():
+    """Create the reusable headless Game for this worker process"""
+    global _game
+    _game = headless.create_game()
+
+
+def play(game, policy, seed, start_speed=5, max_frames=20000, timestep=1):
+    """Play one seeded game to the end and return (score, frames, death_cause).
+
+    The policy is asked once per update, and each update simulates `timestep` frames.
+    """
+    random.seed(seed)
+    game.reset_game()
+    game.speed = start_speed
+
+    frames = 0
+    while not game.game_over and frames < max_frames:
+        if policy(game):
+            game.player.jump()
+        game.update(timestep)
+        frames += timestep
+
+    return game.score // 10, frames, game.death_cause
+
+
+def run_chunk(tasks):
+    """Play a chunk of (seed, distance, start_speed, max_frames, timestep) tasks in this worker"""
+    results = []
+    for seed, distance, start_speed, max_frames, timestep in tasks:
+        score, frames, death_cause = play(_game, JumpWhenClose(distance), seed, start_speed,
+                                          max_frames, timestep)
+        results.append(RunResult(seed, distance, start_speed, score, frames, death_cause))
+    return results
+
+
+def run_sweep(tasks, workers=None, chunk_size=64):
+    """Shard tasks across a process pool and yield RunResults as chunks finish"""
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(run_chunk, chunk) for chunk in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
+
+
+def place_rock(game, rock, x, speed, jump):
+    """Reset to a game with one rock at x on the ground and no spawning"""
+    import forest_runner
+
+    random.seed(0)
+    game.reset_game()
+    game.obstacles.clear()
+    game.spawn_timer = -10 ** 9  # Never spawn during the check
+    game.speed = speed
+    image = forest_runner.obstacle_images[rock]
+    game.obstacles.spawn(rock, x, forest_runner.GROUND_HEIGHT - image.get_height(), speed)
+    if jump:
+        game.player.jump()
+
+
+def check_timestep(game, timesteps, speeds=(5, 5.5, 10, 17, 25, 30, 40)):
+    """Play one update of `timestep` frames and the same frames one at a time
+    for a grid of rocks, speeds, positions and jumps, and return every case
+    where game over, death cause or score differ (e.g. a rock that passed
+    through the player within one update going unnoticed)"""
+    import forest_runner
+
+    mismatches = []
+    for timestep, rock, speed, jump, x in itertools.product(
+            timesteps, range(len(forest_runner.obstacle_images)), speeds, (False, True), range(0, 800, 10)):
+        place_rock(game, rock, x, speed, jump)
+        game.update(timestep)
+        stepped = (game.game_over, game.death_cause, game.score)
+
+        place_rock(game, rock, x, speed, jump)
+        for _ in range(timestep):
+            if game.game_over:
+                break
+            game.update()
+        single = (game.game_over, game.death_cause, game.score)
+
+        if stepped != single:
+            mismatches.append((timestep, forest_runner.rock_options[rock], speed, jump, x, stepped, single))
+    return mismatches
+
+
+class Summary:
+    """Aggregated results for one (distance, start_speed) configuration"""
+
+    def __init__(self, bin_width):
+        self.bin_width = bin_width
+        self.runs = 0
+        self.total_score = 0
+        self.best_score = 0
+        self.total_frames = 0
+        self.histogram = collections.Counter()
+        self.death_causes = collections.Counter()
+
+    def add(self, result):
+        self.runs += 1
+        self.total_score += result.score
+        self.best_score = max(self.best_score, result.score)
+        self.total_frames += result.frames
+        self.histogram[result.score // self.bin_width * self.bin_width] += 1
+        self.death_causes[result.death_cause or 'survived'] += 1
+
+    def report(self, title):
+        lines = [f"{title}: {self.runs} runs, mean score {self.total_score / self.runs:.1f}, "
+                 f"best {self.best_score}"]
+
+        # Score histogram
+        peak = max(self.histogram.values())
+        for low in sorted(self.histogram):
+            count = self.histogram[low]
+            bar = '#' * max(1, 40 * count // peak)
+            lines.append(f"  {low:5d}-{low + self.bin_width - 1:<5d} {count:7d} {bar}")
+
+        # Death causes by rock type
+        causes = ", ".join(f"{cause} {100 * count / self.runs:.1f}%"
+                           for cause, count in self.death_causes.most_common())
+        lines.append(f"  deaths: {causes}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate scripted jump policies over many headless games")
+    parser.add_argument('--runs', type=int, default=1000, help="games per configuration")
+    parser.add_argument('--distance', type=int, nargs='+', default=[40],
+                        help="jump when the nearest obstacle is closer than this many pixels "
+                             "(the policy plays at about 20-60; from about 80 it lands on the first rock)")
+    parser.add_argument('--start-speed', type=float, nargs='+', default=[5],
+                        help="initial scroll speed (difficulty)")
+    parser.add_argument('--max-frames', type=int, default=20000, help="stop a game after this many frames")
+    parser.add_argument('--timestep', type=int, default=1,
+                        help="frames simulated per update (the policy decides once per update)")
+    parser.add_argument('--check', action='store_true',
+                        help="only check that updates of --timestep frames (default 2 4 8 10) "
+                             "collide and score like single frames, then exit")
+    parser.add_argument('--seed', type=int, default=0, help="first seed; run i uses seed + i")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=64, help="games per dispatched task")
+    parser.add_argument('--bin', type=int, default=50, help="score histogram bin width")
+    args = parser.parse_args()
+
+    if args.check:
+        timesteps = [args.timestep] if args.timestep > 1 else [2, 4, 8, 10]
+        mismatches = check_timestep(headless.create_game(), timesteps)
+        for timestep, rock, speed, jump, x, stepped, single in mismatches:
+            print(f"timestep {timestep}, {rock} at x {x}, speed {speed}, jump {jump}: "
+                  f"(game over, cause, score) {stepped} vs {single} in single frames")
+        print(f"Timestep check: {len(mismatches)} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+    configs = list(itertools.product(args.distance, args.start_speed))
+    tasks = [(args.seed + i, distance, start_speed, args.max_frames, args.timestep)
+             for distance, start_speed in configs
+             for i in range(args.runs)]
+
+    summaries = {config: Summary(args.bin) for config in configs}
+    start = time.perf_counter()
+    done = 0
+    for result in run_sweep(tasks, args.workers, args.chunk_size):
+        summaries[(result.distance, result.start_speed)].add(result)
+        done += 1
+        if done % 1000 == 0:
+            print(f"{done}/{len(tasks)} runs")
+    elapsed = time.perf_counter() - start
+
+    for (distance, start_speed), summary in summaries.items():
+        print(summary.report(f"distance {distance}px, start speed {start_speed}"))
+
+    rate = done / elapsed
+    print(f"{done} runs in {elapsed:.1f}s: {rate:.1f} runs/s, "
+          f"{rate / args.workers:.1f} runs/s per core ({args.workers} workers)")
+
+
+if __name__ == '__main__':
+    main()
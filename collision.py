@@ -0,0 +1,90 @@
+"""
+Collision for Forest Runner
+Swept axis-aligned box tests: instead of checking two boxes where they end up
+after a frame, the boxes are checked along the whole path one of them moves
+(relative to the other) during the frame, so fast or thin obstacles cannot
+pass through the player between frames
+"""
+
+import math
+
+
+def sweep_axis(a0, a1, b0, b1, d):
+    """Return (enter, exit) times at which span [b0, b1] moving by d overlaps [a0, a1]"""
+    if d == 0:
+        if b0 < a1 and b1 > a0:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+    enter = (a0 - b1) / d
+    exit = (a1 - b0) / d
+    return (enter, exit) if d > 0 else (exit, enter)
+
+
+def sweep(a, b, dx, dy):
+    """Swept AABB test of box b moving by (dx, dy) against a fixed box a.
+
+    Boxes are (x, y, width, height) sequences such as pygame.Rect. Returns the
+    (enter, exit) part of the move, as fractions in [0, 1], during which the
+    boxes overlap, or None if they never do.
+    """
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    x_enter, x_exit = sweep_axis(ax, ax + aw, bx, bx + bw, dx)
+    y_enter, y_exit = sweep_axis(ay, ay + ah, by, by + bh, dy)
+    enter = max(x_enter, y_enter, 0.0)
+    exit = min(x_exit, y_exit, 1.0)
+    if enter >= exit:
+        return None
+    return enter, exit
+
+
+def overlap_size(a, b, dx, dy, t):
+    """Width and height of the overlap of a and b after b moved by t * (dx, dy)"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    bx += dx * t
+    by += dy * t
+    return (min(ax + aw, bx + bw) - max(ax, bx),
+            min(ay + ah, by + bh) - max(ay, by))
+
+
+def max_overlap_area(a, b, dx, dy):
+    """Largest overlap area of box a and box b at any point while b moves by (dx, dy).
+
+    Returns 0 when the boxes never overlap. Between the times where an edge of
+    b crosses the matching edge of a, the overlap width and height change
+    linearly, so the area is a quadratic whose maximum is at either end of the
+    piece or at its vertex.
+    """
+    interval = sweep(a, b, dx, dy)
+    if interval is None:
+        return 0
+    enter, exit = interval
+
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    times = {enter, exit}
+    for a_edge, b_edge, d in ((ax, bx, dx), (ax + aw, bx + bw, dx),
+                              (ay, by, dy), (ay + ah, by + bh, dy)):
+        if d:
+            t = (a_edge - b_edge) / d
+            if enter < t < exit:
+                times.add(t)
+    times = sorted(times)
+
+    width, height = overlap_size(a, b, dx, dy, times[0])
+    best = width * height
+    for start, end in zip(times, times[1:]):
+        start_width, start_height = width, height
+        width, height = overlap_size(a, b, dx, dy, end)
+        best = max(best, width * height)
+
+        # Vertex of (w0 + w't)(h0 + h't), a maximum only when the slopes differ in sign
+        width_slope = (width - start_width) / (end - start)
+        height_slope = (height - start_height) / (end - start)
+        if width_slope * height_slope < 0:
+            vertex = start - (start_width * height_slope + start_height * width_slope) / (2 * width_slope * height_slope)
+            if start < vertex < end:
+                vertex_width, vertex_height = overlap_size(a, b, dx, dy, vertex)
+                best = max(best, vertex_width * vertex_height)
+    return best
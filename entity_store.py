@@ -0,0 +1,104 @@
+"""
+Entity Store for Forest Runner
+Keeps scrolling entities (rocks, decorations, particles) in flat typed arrays
+so they can be moved, culled and drawn in bulk instead of one sprite at a time
+"""
+
+from array import array
+from itertools import compress, repeat
+from math import copysign, floor
+from operator import add, le, sub
+
+import pygame
+
+
+class EntityStore:
+    def __init__(self, images):
+        """Create an empty store that draws entities from a shared image table"""
+        self.images = list(images)
+
+        # One slot per entity in each array (struct-of-arrays layout)
+        self.x = array('d')
+        self.y = array('d')
+        self.speed = array('d')
+        self.width = array('d')
+        self.image_index = array('i')
+        self.start_x = array('d')  # x before the last move (entities spawned since are not in it)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __bool__(self):
+        return len(self.x) > 0
+
+    def spawn(self, image_index, x, y, speed):
+        """Add an entity and return its slot index"""
+        self.x.append(x)
+        self.y.append(y)
+        self.speed.append(speed)
+        self.width.append(self.images[image_index].get_width())
+        self.image_index.append(image_index)
+        return len(self.x) - 1
+
+    def clear(self):
+        """Remove every entity"""
+        for column in (self.x, self.y, self.speed, self.width, self.image_index, self.start_x):
+            del column[:]
+
+    def move(self, steps=1):
+        """Move every entity left by its speed (per step, in whole pixels)"""
+        self.start_x = self.x
+        if not self.x:
+            return
+
+        # map() with builtin functions runs the whole loop in C. Positions are
+        # rounded to whole pixels (half away from zero) every step, as assigning
+        # to pygame.Rect.x did, so rocks at x.5 speeds keep their old pace.
+        for _ in range(steps):
+            moved = array('d', map(sub, self.x, self.speed))
+            self.x = array('d', map(copysign, map(floor, map(add, map(abs, moved), repeat(0.5))), moved))
+
+    def cull(self):
+        """Drop entities that are fully past the left edge of the screen.
+
+        Kept apart from move() so collisions can be checked along the whole
+        move before anything that passed through the player is removed.
+        """
+        if not self.x:
+            return
+
+        # Right edges; anything fully past the left edge is removed
+        rights = array('d', map(add, self.x, self.width))
+        if min(rights) < 0:
+            keep = list(map(le, repeat(0.0), rights))
+            self.x = array('d', compress(self.x, keep))
+            self.y = array('d', compress(self.y, keep))
+            self.speed = array('d', compress(self.speed, keep))
+            self.width = array('d', compress(self.width, keep))
+            self.image_index = array('i', compress(self.image_index, keep))
+
+    def path(self, index, steps):
+        """x of one entity before the last move and after each of its steps"""
+        x = self.start_x[index]
+        speed = self.speed[index]
+        positions = [x]
+        for _ in range(steps):
+            x -= speed
+            x = copysign(floor(abs(x) + 0.5), x)
+            positions.append(x)
+        return positions
+
+    def rightmost(self):
+        """Largest x position of any entity, or None if the store is empty"""
+        return max(self.x) if self.x else None
+
+    def rect(self, index):
+        """Build a pygame.Rect for one entity (used for collision checks)"""
+        image = self.images[self.image_index[index]]
+        return pygame.Rect(int(self.x[index]), int(self.y[index]),
+                           image.get_width(), image.get_height())
+
+    def blit_items(self):
+        """Return (surface, position) pairs ready for Surface.blits"""
+        return list(zip(map(self.images.__getitem__, self.image_index),
+                        zip(self.x, self.y)))
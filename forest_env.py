@@ -0,0 +1,132 @@
+"""
+Training Environment for Forest Runner
+Gym-style reset()/step(action) API around Game with frame skip, compact
+feature observations and zero-copy pixel observations
+
+Requires NumPy (pixel observations are pygame.surfarray views).
+"""
+
+import random
+
+import numpy as np
+import pygame
+
+import headless
+
+# Actions
+NOOP = 0
+JUMP = 1
+
+# Observation modes
+OBSERVATIONS = ('features', 'pixels', 'both')
+
+
+class ForestRunnerEnv:
+    def __init__(self, frame_skip=4, observation='features', max_frames=None):
+        """Create a headless environment.
+
+        frame_skip: simulation frames per step (the action is applied on the first one)
+        observation: 'features', 'pixels' or 'both'
+        max_frames: end the episode after this many simulation frames (None for no limit)
+        """
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"observation must be one of {OBSERVATIONS}, not {observation!r}")
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1")
+
+        self.game = headless.create_game()
+        self.frame_skip = frame_skip
+        self.observation = observation
+        self.max_frames = max_frames
+        self.frames = 0
+        self.done = False  # Set when an episode ends; step() needs a reset() after that
+
+        # Imported after headless setup so the dummy drivers are in place
+        import forest_runner
+        self.rock_options = forest_runner.rock_options
+        self.screen_width = forest_runner.SCREEN_WIDTH
+
+        # Two render targets used in turn for pixel observations, so the view returned
+        # by one step stays valid while the next step draws; never drawn in features-only mode
+        self.render_surfaces = []
+        self.render_index = 0
+        if observation != 'features':
+            size = (forest_runner.SCREEN_WIDTH, forest_runner.SCREEN_HEIGHT)
+            self.render_surfaces = [pygame.Surface(size).convert() for _ in range(2)]
+
+    def reset(self, seed=None):
+        """Start a new episode and return the first observation"""
+        if seed is not None:
+            random.seed(seed)
+        self.game.reset_game()
+        self.frames = 0
+        self.done = False
+        return self.observe()
+
+    def step(self, action):
+        """Apply an action, advance frame_skip frames and return (observation, reward, done, info).
+
+        The reward is the number of frames survived during the step. Once an
+        episode is done, reset() must be called before stepping again.
+        """
+        # Updating a finished game would run its game over handling (sound, metrics) again
+        if self.done:
+            raise RuntimeError("step() called after the episode ended; call reset() first")
+
+        if action == JUMP:
+            self.game.player.jump()
+
+        reward = 0
+        for _ in range(self.frame_skip):
+            self.game.update()
+            self.frames += 1
+            if self.game.game_over:
+                break
+            reward += 1
+
+        done = self.game.game_over or (self.max_frames is not None and self.frames >= self.max_frames)
+        self.done = done
+        info = {
+            'score': self.game.score // 10,
+            'frames': self.frames,
+            'death_cause': self.game.death_cause
+        }
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        if self.observation == 'features':
+            return self.features()
+        if self.observation == 'pixels':
+            return self.render()
+        return self.features(), self.render()
+
+    def features(self):
+        """Feature vector: player y, player velocity, next obstacle distance,
+        next obstacle type (rock index, -1 if none) and scroll speed"""
+        nearest = self.game.next_obstacle()
+        if nearest is None:
+            distance, rock_index = self.screen_width, -1
+        else:
+            distance, rock_index = nearest[0], self.rock_options.index(nearest[1])
+
+        player = self.game.player
+        return np.array([player.rect.y, player.velocity, distance, rock_index, self.game.speed],
+                        dtype=np.float32)
+
+    def render(self):
+        """Draw the current frame and return a (width, height, 3) uint8 view of it.
+
+        The view references a render surface directly (no copy). Render surfaces
+        are used in turn, so a view stays valid until the step after next; copy
+        it to keep it longer.
+        """
+        surface = self.render_surfaces[self.render_index]
+
+        # A live view keeps its surface locked, and locked surfaces cannot be blitted to
+        if surface.get_locked():
+            raise RuntimeError("A pixel observation from two steps ago is still referenced; "
+                               "copy it (obs.copy()) if it needs to outlive the next step")
+
+        self.render_index = 1 - self.render_index
+        self.game.draw_world(surface)
+        return pygame.surfarray.pixels3d(surface)
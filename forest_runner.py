@@ -1,8 +1,18 @@
 import pygame
+import argparse
 import random
 import sys
 import os
+import time
 import audio_manager  # Import our custom audio manager
+import metrics
+from collision import max_overlap_area
+from entity_store import EntityStore
+from frame_capture import FrameCapture
+from input_latency import FramePacer
+from memory_diagnostics import MemoryDiagnostics
+from metrics import JsonlExporter, MetricsServer
+from render_backend import BlitBackend, TextureBackend
 
 # Initialize pygame
 pygame.init()
@@ -20,6 +30,7 @@ BLACK = (0, 0, 0)
 GRAY = (100, 100, 100)
 DARK_GRAY = (50, 50, 50)
 LIGHT_BLUE = (173, 216, 230)
+BACKGROUND_COLOR = (50, 50, 80)  # Dark blue-gray background for better contrast with white text
 FPS = 60
 
 # Set all text to use white color
@@ -66,16 +77,54 @@ def render_text_with_border(font, text, text_color, border_color):
 
 # Load background images with meaningful names
 background_layers = {
-    'sky': {'speed': 0.1, 'image': None},
-    'cloud': {'speed': 0.3, 'image': None},
-    'hills': {'speed': 0.5, 'image': None},
-    'tree2': {'speed': 0.7, 'image': None},
-    'tree1': {'speed': 0.9, 'image': None},
-    'bush': {'speed': 1.1, 'image': None},
-    'support': {'speed': 1.3, 'image': None},
-    'ground': {'speed': 1.5, 'image': None}
+    'sky': {'speed': 0.1, 'image': None, 'pieces': None},
+    'cloud': {'speed': 0.3, 'image': None, 'pieces': None},
+    'hills': {'speed': 0.5, 'image': None, 'pieces': None},
+    'tree2': {'speed': 0.7, 'image': None, 'pieces': None},
+    'tree1': {'speed': 0.9, 'image': None, 'pieces': None},
+    'bush': {'speed': 1.1, 'image': None, 'pieces': None},
+    'support': {'speed': 1.3, 'image': None, 'pieces': None},
+    'ground': {'speed': 1.5, 'image': None, 'pieces': None}
 }
 
+def trim_layer(image, min_band=8):
+    """Split a layer into (surface, offset) pieces covering only its visible pixels.
+    
+    Runs of at least min_band fully opaque rows become convert()ed bands, which
+    are copied instead of alpha-blended. The rows in between are cropped to the
+    bounding rect of their visible pixels and keep per-pixel alpha.
+    """
+    width, height = image.get_size()
+    
+    # A row is opaque when all of its pixels have alpha 255
+    opaque = pygame.mask.from_surface(image, 254)
+    row = pygame.mask.Mask((width, 1), fill=True)
+    solid = [opaque.overlap_area(row, (0, y)) == width for y in range(height)]
+    
+    # Split into runs of opaque and non-opaque rows; short opaque runs stay with their neighbours
+    runs = []
+    y = 0
+    while y < height:
+        start = y
+        while y < height and solid[y] == solid[start]:
+            y += 1
+        band_solid = solid[start] and y - start >= min_band
+        if runs and not band_solid and not runs[-1][2]:
+            runs[-1] = (runs[-1][0], y, False)
+        else:
+            runs.append((start, y, band_solid))
+    
+    pieces = []
+    for start, end, band_solid in runs:
+        band = image.subsurface((0, start, width, end - start))
+        if band_solid:
+            pieces.append((band.convert(), (0, start)))
+            continue
+        bounds = band.get_bounding_rect()
+        if bounds.width and bounds.height:
+            pieces.append((band.subsurface(bounds), (bounds.x, start + bounds.y)))
+    return pieces
+
 # Load each background image
 for layer_name in background_layers:
     try:
@@ -88,23 +137,34 @@ for layer_name in background_layers:
             new_width = int(new_height * aspect_ratio)
             img = pygame.transform.scale(img, (new_width, new_height))
             background_layers[layer_name]['image'] = img
-            print(f"Loaded {layer_name} background")
+            
+            # Only the visible pixels are drawn; report how much of the layer that is
+            pieces = trim_layer(img)
+            background_layers[layer_name]['pieces'] = pieces
+            total = new_width * new_height
+            drawn = sum(piece.get_width() * piece.get_height() for piece, _ in pieces)
+            blended = sum(piece.get_width() * piece.get_height() for piece, _ in pieces
+                          if piece.get_flags() & pygame.SRCALPHA)
+            print(f"Loaded {layer_name} background: draws {drawn / total:.0%} of its pixels, "
+                  f"{blended / total:.0%} alpha-blended ({len(pieces)} pieces)")
     except pygame.error as e:
         print(f"Could not load background image {layer_name}.png: {e}")
 
 # Background class for parallax scrolling
 class Background:
-    def __init__(self, image, speed):
+    def __init__(self, image, speed, pieces=None):
         self.image = image
         self.speed = speed
         self.width = image.get_width()
+        # Parts of the image that are actually drawn, with their offsets (see trim_layer)
+        self.pieces = pieces if pieces is not None else [(image, (0, 0))]
         # Start with three copies to ensure full coverage
         self.positions = [0, self.width, self.width * 2]
     
-    def update(self):
+    def update(self, steps=1):
         # Move all copies of the background
         for i in range(len(self.positions)):
-            self.positions[i] -= self.speed
+            self.positions[i] -= self.speed * steps
             
             # If an image is completely off screen to the left, move it to the right
             if self.positions[i] + self.width < 0:
@@ -113,59 +173,167 @@ class Background:
                 # Place this image to the right of the rightmost one
                 self.positions[i] = rightmost + self.width
     
-    def draw(self, surface):
-        # Draw all copies of the background
-        for pos in self.positions:
-            surface.blit(self.image, (pos, 0))
-        
-        # Draw an extra copy if needed to fill any gaps at the right edge
+    def blit_items(self):
+        # Every copy of the background, plus an extra one if needed to fill any gaps at the right edge
+        copies = list(self.positions)
         rightmost = max(self.positions)
         if rightmost < SCREEN_WIDTH:
-            surface.blit(self.image, (rightmost + self.width, 0))
+            copies.append(rightmost + self.width)
+        
+        # One (piece, position) pair for every piece of every copy; offsets are added after
+        # the truncation a blit at the copy's float position would do, so pieces line up
+        return [(piece, (int(pos) + dx, dy)) for pos in copies for piece, (dx, dy) in self.pieces]
+    
+    def draw(self, surface):
+        # Draw all copies of the background
+        surface.blits(self.blit_items(), doreturn=False)
 
-# Player class
-class Player(pygame.sprite.Sprite):
-    def __init__(self):
-        super().__init__()
+# Idle screen renderer for screens where almost nothing moves
+class IdleScreen:
+    def __init__(self, surface, backend):
+        self.surface = surface
+        self.backend = backend  # Presents the surface (whole or in parts)
+        self.snapshot = None  # Frozen frame everything else is drawn over
+        self.drawn = []       # Rects drawn over the snapshot last time
+    
+    @property
+    def frozen(self):
+        return self.snapshot is not None
+    
+    def freeze(self, draw):
+        """Draw the static frame once, keep a copy of it and present it"""
+        draw(self.surface)
+        self.snapshot = self.surface.copy()
+        self.drawn = []
+        self.backend.present_surface(self.surface)
+    
+    def thaw(self):
+        """Drop the snapshot so the next frame is frozen again"""
+        self.snapshot = None
+        self.drawn = []
+    
+    def redraw(self, draw):
+        """Restore the snapshot under last time's moving parts, draw them again
+        and push only the changed regions to the display"""
+        for rect in self.drawn:
+            self.surface.blit(self.snapshot, rect, rect)
+        rects = draw(self.surface)
+        self.backend.present_surface(self.surface, self.drawn + rects)
+        self.drawn = rects
+    
+    def wait(self, timeout):
+        """Block until an event arrives or timeout (ms) passes; return pending events"""
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+# Retained-mode HUD: score, high score and player name composited into one cached surface
+class Hud:
+    def __init__(self, font, text_color, border_color):
+        self.font = font
+        self.text_color = text_color
+        self.border_color = border_color
         
-        # Load idle animation frames
-        self.idle_frames = []
-        for i in range(1, 11):  # Idle frames 1-10
-            try:
-                img_path = os.path.join('hero', f'Idle ({i}).png')
-                if os.path.exists(img_path):
-                    img = pygame.image.load(img_path).convert_alpha()
-                    # Scale the image to a reasonable size
-                    img = pygame.transform.scale(img, (75, 80))
-                    self.idle_frames.append(img)
-            except pygame.error as e:
-                print(f"Could not load idle frame {i}: {e}")
+        # Outlined digit atlas; the premultiplied copies composite into the cached strip
+        # exactly like blitting the outlined text straight to the screen
+        self.glyphs = {d: render_text_with_border(font, d, text_color, border_color) for d in '0123456789'}
+        self.digits = {d: glyph.premul_alpha() for d, glyph in self.glyphs.items()}
         
-        # Load run animation frames
-        self.run_frames = []
-        for i in range(1, 9):  # Run frames 1-8
-            try:
-                img_path = os.path.join('hero', f'Run ({i}).png')
-                if os.path.exists(img_path):
-                    img = pygame.image.load(img_path).convert_alpha()
-                    # Scale the image with better proportions (increased width)
-                    img = pygame.transform.scale(img, (75, 80))
-                    self.run_frames.append(img)
-            except pygame.error as e:
-                print(f"Could not load run frame {i}: {e}")
+        # Cached HUD strip covering both text rows
+        self.surface = pygame.Surface((SCREEN_WIDTH, 70), pygame.SRCALPHA)
+        self.bounds = pygame.Rect(0, 0, 0, 0)  # Area that holds drawn pixels
+        
+        # Last value, covered rect and (surface, position) items for each region
+        self.values = {}
+        self.rects = {}
+        self.items = {}
         
-        # Load jump animation frames
-        self.jump_frames = []
-        for i in range(1, 13):  # Jump frames 1-12
+        # Static labels are drawn once
+        self.draw_text('score_label', "Score: ", (10, 10))
+        self.draw_text('high_score_label', "High Score: ", (10, 40))
+    
+    def draw_text(self, region, text, pos):
+        """Render an outlined string into a region of the HUD"""
+        rendered = render_text_with_border(self.font, text, self.text_color, self.border_color)
+        self.clear(region)
+        self.rects[region] = self.surface.blit(rendered.premul_alpha(), pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+        self.items[region] = [(rendered, pos)]
+        self.bounds.union_ip(self.rects[region])
+    
+    def draw_number(self, region, label, number, pos):
+        """Compose a 4+ digit number from the digit atlas right after its label"""
+        digits = f"{number:04d}"
+        self.clear(region)
+        self.items[region] = []
+        rect = None
+        for i, digit in enumerate(digits):
+            # Place each digit where it ends in the full rendered string (keeps kerning and rounding)
+            x = pos[0] + self.font.size(label + digits[:i + 1])[0] - self.font.size(digit)[0]
+            drawn = self.surface.blit(self.digits[digit], (x, pos[1]), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self.items[region].append((self.glyphs[digit], (x, pos[1])))
+            rect = drawn if rect is None else rect.union(drawn)
+        self.rects[region] = rect
+        self.bounds.union_ip(rect)
+    
+    def clear(self, region):
+        if region in self.rects:
+            self.surface.fill((0, 0, 0, 0), self.rects.pop(region))
+    
+    def changed(self, region, value):
+        if self.values.get(region) == value:
+            return False
+        self.values[region] = value
+        return True
+    
+    def update(self, score, high_score, player_name):
+        """Re-render only the regions whose value changed"""
+        if self.changed('score', score):
+            self.draw_number('score', "Score: ", score, (10, 10))
+        if self.changed('high_score', high_score):
+            self.draw_number('high_score', "High Score: ", high_score, (10, 40))
+        if self.changed('name', player_name):
+            text = f"Player: {player_name}"
+            width = self.font.size(text)[0] + 2
+            self.draw_text('name', text, (SCREEN_WIDTH - width - 10, 10))
+    
+    def layout(self):
+        """All (outlined surface, position) pairs currently shown, for non-blit backends"""
+        return [item for items in self.items.values() for item in items]
+    
+    def draw(self, surface):
+        """Draw the whole HUD with a single blit"""
+        surface.blit(self.surface, self.bounds.topleft, self.bounds, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+# Hero animation frames, loaded once and shared by every Player instance
+hero_frames = {}
+
+def load_hero_frames(animation, count):
+    """Load (or reuse) the scaled frames of one hero animation"""
+    if animation not in hero_frames:
+        frames = []
+        for i in range(1, count + 1):
             try:
-                img_path = os.path.join('hero', f'Jump ({i}).png')
+                img_path = os.path.join('hero', f'{animation} ({i}).png')
                 if os.path.exists(img_path):
                     img = pygame.image.load(img_path).convert_alpha()
                     # Scale the image with better proportions (increased width)
                     img = pygame.transform.scale(img, (75, 80))
-                    self.jump_frames.append(img)
+                    frames.append(img)
             except pygame.error as e:
-                print(f"Could not load jump frame {i}: {e}")
+                print(f"Could not load {animation.lower()} frame {i}: {e}")
+        hero_frames[animation] = frames
+    return hero_frames[animation]
+
+# Player class
+class Player(pygame.sprite.Sprite):
+    def __init__(self):
+        super().__init__()
+        
+        # Animation frames are shared by every Player instance
+        self.idle_frames = load_hero_frames('Idle', 10)  # Idle frames 1-10
+        self.run_frames = load_hero_frames('Run', 8)     # Run frames 1-8
+        self.jump_frames = load_hero_frames('Jump', 12)  # Jump frames 1-12
         
         # Set initial image
         if self.idle_frames:
@@ -191,25 +359,31 @@ class Player(pygame.sprite.Sprite):
         self.jump_power = -15
         self.gravity = 0.8
         self.is_jumping = False
+        
+        # Rects at the start and after each frame of the last update (for swept collisions)
+        self.trail = [self.rect.copy()]
     
-    def update(self):
-        # Apply gravity
-        if self.is_jumping:
-            self.velocity += self.gravity
-            self.rect.y += self.velocity
-            
-            # Use jump animation
-            self.animate_jump()
-            
-            # Check if landed
-            if self.rect.bottom >= GROUND_HEIGHT:
-                self.rect.bottom = GROUND_HEIGHT
-                self.is_jumping = False
-                self.velocity = 0
-                self.current_frame = 0  # Reset animation frame
-        else:
-            # Use run animation when not jumping
-            self.animate_run()
+    def update(self, steps=1):
+        self.trail = [self.rect.copy()]
+        for _ in range(steps):
+            # Apply gravity
+            if self.is_jumping:
+                self.velocity += self.gravity
+                self.rect.y += self.velocity
+                
+                # Use jump animation
+                self.animate_jump()
+                
+                # Check if landed
+                if self.rect.bottom >= GROUND_HEIGHT:
+                    self.rect.bottom = GROUND_HEIGHT
+                    self.is_jumping = False
+                    self.velocity = 0
+                    self.current_frame = 0  # Reset animation frame
+            else:
+                # Use run animation when not jumping
+                self.animate_run()
+            self.trail.append(self.rect.copy())
     
     def update_start_screen(self):
         # Use idle animation for the start screen
@@ -296,55 +470,79 @@ class Player(pygame.sprite.Sprite):
             # Play jump sound using audio manager
             audio.play_sound('jump')
 
-# Obstacle class (rocks)
-class Obstacle(pygame.sprite.Sprite):
-    def __init__(self, speed):
-        super().__init__()
-        # Choose a random rock image from the available options
-        rock_options = ['Rock1.png', 'Rock2.png', 'Rock3.png', 'Rock4.png']
-        chosen_rock = random.choice(rock_options)
-        
-        # Try to load the obstacle image
-        try:
-            self.image = pygame.image.load(f'obstacles/{chosen_rock}').convert_alpha()
-            
-            # Scale the image to an appropriate size based on which rock it is
-            if chosen_rock == 'Rock1.png':
-                self.image = pygame.transform.scale(self.image, (80, 70))
-            elif chosen_rock == 'Rock2.png':
-                self.image = pygame.transform.scale(self.image, (75, 65))
-            elif chosen_rock == 'Rock3.png':
-                self.image = pygame.transform.scale(self.image, (70, 60))
-            else:  # Rock4.png
-                self.image = pygame.transform.scale(self.image, (85, 75))
-                
-        except pygame.error:
-            # Fallback to a rectangle if image loading fails
-            print(f"Could not load obstacle image {chosen_rock}. Using fallback.")
-            self.image = pygame.Surface((40, 60))
-            self.image.fill(BLACK)
-        
-        self.rect = self.image.get_rect()
-        self.rect.bottom = GROUND_HEIGHT
-        self.rect.left = SCREEN_WIDTH
-        self.speed = speed
-        
-        # Store which rock type this is for collision detection
-        self.rock_type = chosen_rock
-    
-    def update(self):
-        self.rect.x -= self.speed
-        # Remove if off screen
-        if self.rect.right < 0:
-            self.kill()
+# Obstacle images (rocks), loaded once and shared by every spawned obstacle
+rock_options = ['Rock1.png', 'Rock2.png', 'Rock3.png', 'Rock4.png']
+
+# Display size for each rock
+rock_sizes = {
+    'Rock1.png': (80, 70),
+    'Rock2.png': (75, 65),
+    'Rock3.png': (70, 60),
+    'Rock4.png': (85, 75)
+}
+
+# Hitbox for each rock as fractions of its image (x offset, y offset, width, height)
+rock_hitboxes = {
+    'Rock1.png': (0.35, 0.2, 0.3, 0.7),   # Taller, narrower hitbox for Rock1
+    'Rock2.png': (0.3, 0.25, 0.4, 0.6),   # Medium hitbox for Rock2
+    'Rock3.png': (0.25, 0.3, 0.5, 0.5),   # Wider hitbox for Rock3
+    'Rock4.png': (0.2, 0.25, 0.6, 0.6)    # Largest hitbox for Rock4
+}
+default_hitbox = (0.25, 0.25, 0.5, 0.5)
+
+obstacle_images = []
+for rock_type in rock_options:
+    try:
+        img = pygame.image.load(os.path.join('obstacles', rock_type)).convert_alpha()
+        img = pygame.transform.scale(img, rock_sizes[rock_type])
+    except pygame.error:
+        # Fallback to a rectangle if image loading fails
+        print(f"Could not load obstacle image {rock_type}. Using fallback.")
+        img = pygame.Surface((40, 60))
+        img.fill(BLACK)
+    obstacle_images.append(img)
+
+# Telemetry, always recorded and only exported with --metrics or --metrics-port
+frame_time = metrics.registry.histogram(
+    'forest_runner_frame_seconds', "Time between presented gameplay frames",
+    (0.004, 0.008, 0.012, 0.016, 0.017, 0.020, 0.025, 0.033, 0.050, 0.100, 0.250))
+frames_presented = metrics.registry.counter('forest_runner_frames_total', "Gameplay frames presented")
+obstacles_spawned = {rock_type: metrics.registry.counter('forest_runner_obstacles_spawned_total',
+                                                         "Obstacles spawned", {'rock': rock_type})
+                     for rock_type in rock_options}
+collisions = {rock_type: metrics.registry.counter('forest_runner_collisions_total',
+                                                  "Games ended by hitting an obstacle", {'rock': rock_type})
+              for rock_type in rock_options}
+games_played = metrics.registry.counter('forest_runner_games_total', "Games finished")
+game_scores = metrics.registry.histogram('forest_runner_score', "Displayed score at game over",
+                                         (10, 25, 50, 100, 250, 500, 1000, 2500))
+last_score = metrics.registry.gauge('forest_runner_last_score', "Displayed score of the last finished game")
+high_score_gauge = metrics.registry.gauge('forest_runner_high_score', "Displayed high score")
+
+def get_player_hitbox(rect):
+    """Build the (smaller than the sprite) collision hitbox for a player rect"""
+    return pygame.Rect(
+        rect.x + rect.width * 0.3,  # Moved right edge in more
+        rect.y + rect.height * 0.2,
+        rect.width * 0.4,  # Made hitbox narrower (was 0.5)
+        rect.height * 0.7
+    )
+
+def get_obstacle_hitbox(rect, rock_type):
+    """Build the collision hitbox for an obstacle rect of the given rock type"""
+    fx, fy, fw, fh = rock_hitboxes.get(rock_type, default_hitbox)
+    return pygame.Rect(
+        rect.x + rect.width * fx,
+        rect.y + rect.height * fy,
+        rect.width * fw,
+        rect.height * fh
+    )
 
 # Game class
 class Game:
-    def __init__(self):
+    def __init__(self, capture=None, pacer=None, memory=None, backend=None):
         self.player = Player()
-        self.all_sprites = pygame.sprite.Group()
-        self.obstacles = pygame.sprite.Group()
-        self.all_sprites.add(self.player)
+        self.obstacles = EntityStore(obstacle_images)
         
         self.speed = 5
         self.score = 0
@@ -353,10 +551,20 @@ class Game:
         self.high_score_name = self.load_high_score_name()  # Load name of high score holder
         self.game_over = False
         self.spawn_timer = 0
+        self.death_cause = None    # Rock type that ended the last run
         self.game_started = False  # Flag to track if the game has started
         self.change_name = False   # Flag to indicate if player wants to change name
         self.input_active = True   # Flag for name input activity
         self.change_name = False   # Flag to indicate if player wants to change name
+        self.backend = backend if backend is not None else BlitBackend(screen)  # Draws and presents frames
+        self.idle_screen = IdleScreen(screen, self.backend)  # Event-driven renderer for static screens
+        self.capture = capture     # Optional FrameCapture fed every presented frame
+        self.pacer = pacer         # Optional FramePacer measuring input latency
+        if pacer is not None:
+            pacer.discard()  # Latency is measured from the first gameplay frame on
+        self.memory = memory       # Optional MemoryDiagnostics, checkpointed on every restart
+        self.last_frame = None     # perf_counter of the last presented gameplay frame
+        self.hud = Hud(score_font, TEXT_COLOR, BLACK)  # Cached score/high score/name display
         
         # Create parallax backgrounds with different speeds
         self.backgrounds = []
@@ -368,7 +576,8 @@ class Game:
                 self.backgrounds.append(
                     Background(
                         background_layers[layer_name]['image'], 
-                        background_layers[layer_name]['speed']
+                        background_layers[layer_name]['speed'],
+                        background_layers[layer_name]['pieces']
                     )
                 )
     
@@ -389,10 +598,25 @@ class Game:
         # Start playing background music
         audio.play_music()
         
+        # The start screen is drawn in idle mode: everything that never moves is
+        # frozen into a snapshot and only the character, the typed name and the
+        # cursor are redrawn when they actually change
+        self.idle_screen.thaw()
+        last_shown = None
+        animation_clock = pygame.time.get_ticks()
+        
         while waiting:
+            # Sleep until an event arrives or the next animation/cursor change is due
+            if self.idle_screen.frozen:
+                now = pygame.time.get_ticks()
+                timeout = min(1000 * self.player.animation_speed, 500 - now % 500)
+                events = self.idle_screen.wait(int(timeout) + 1)
+            else:
+                events = pygame.event.get()
+            
             # Process events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            for event in events:
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     pygame.quit()
                     sys.exit()
                 
@@ -402,12 +626,14 @@ class Game:
                         # Toggle input_active if the user clicked on the input box
                         self.input_active = input_box.collidepoint(event.pos)
                         color = color_active if self.input_active else color_inactive
+                        self.idle_screen.thaw()  # Input box color is part of the snapshot
                     
                     if event.type == pygame.KEYDOWN:
                         if self.input_active:
                             if event.key == pygame.K_RETURN and self.player_name.strip():
                                 # Confirm name when Enter is pressed and name is not empty
                                 name_entered = True
+                                self.idle_screen.thaw()  # Layout changes after the name is entered
                             elif event.key == pygame.K_BACKSPACE:
                                 # Remove last character on backspace
                                 self.player_name = self.player_name[:-1]
@@ -421,62 +647,83 @@ class Game:
                         waiting = False
                         self.game_started = True
             
-            # Update the character's idle animation
-            self.player.update_start_screen()
+            # Update the character's idle animation for every frame that passed while asleep
+            now = pygame.time.get_ticks()
+            while animation_clock + 1000 / FPS <= now:
+                animation_clock += 1000 / FPS
+                self.player.update_start_screen()
             
-            # Draw the start screen
-            screen.fill((50, 50, 80))  # Dark blue-gray background for better contrast with white text
+            # Freeze the static parts of the start screen (redone only when the layout changes)
+            if not self.idle_screen.frozen:
+                self.idle_screen.freeze(
+                    lambda surface: self.draw_start_screen_static(surface, name_entered, input_box, color))
+                last_shown = None
             
-            # Draw static backgrounds
-            for bg in self.backgrounds:
-                bg.draw(screen)
-            
-            # Draw ground line (only if ground image is not loaded)
-            if background_layers['ground']['image'] is None:
-                pygame.draw.line(screen, BLACK, (0, GROUND_HEIGHT), 
-                                (SCREEN_WIDTH, GROUND_HEIGHT), 2)
-            
-            # Draw the character
-            screen.blit(self.player.image, self.player.rect)
-            
-            # Draw welcome text with shadow effect and border
-            welcome_text = render_text_with_border(title_font, "Welcome to Forest Runner!", TEXT_COLOR, BLACK)
-            screen.blit(welcome_text, (SCREEN_WIDTH // 2 - welcome_text.get_width() // 2, 50))
-            
-            if not name_entered:
-                # Draw name input prompt with border
-                name_prompt = render_text_with_border(main_font, "Enter your name:", TEXT_COLOR, BLACK)
-                screen.blit(name_prompt, (SCREEN_WIDTH // 2 - name_prompt.get_width() // 2, 120))
-                
-                # Draw input box
-                pygame.draw.rect(screen, color, input_box, 2)
-                
-                # Render the current text with border
-                txt_surface = render_text_with_border(main_font, self.player_name, TEXT_COLOR, BLACK)
-                # Blit the text
-                screen.blit(txt_surface, (input_box.x + 5, input_box.y + 5))
-                
-                # Draw blinking cursor if input is active
-                if self.input_active and pygame.time.get_ticks() % 1000 < 500:
-                    cursor_x = input_box.x + 5 + txt_surface.get_width() - 2  # Adjust for border
-                    pygame.draw.line(screen, TEXT_COLOR, 
-                                    (cursor_x, input_box.y + 5),
-                                    (cursor_x, input_box.y + 35), 2)
-            else:
-                # Draw instructions after name is entered with border
-                instruction_text = render_text_with_border(main_font, f"Hello, {self.player_name}! Press SPACE to start", TEXT_COLOR, BLACK)
-                screen.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, 150))
+            # Redraw only what changed since the last presented frame
+            cursor_visible = not name_entered and self.input_active and now % 1000 < 500
+            shown = (self.player.image, self.player.rect.topleft, self.player_name, cursor_visible)
+            if shown != last_shown:
+                self.idle_screen.redraw(
+                    lambda surface: self.draw_start_screen_dynamic(surface, name_entered, input_box, cursor_visible))
+                last_shown = shown
+        
+        # Leave idle mode for gameplay
+        self.idle_screen.thaw()
+    
+    def draw_start_screen_static(self, surface, name_entered, input_box, color):
+        """Draw the parts of the start screen that do not move"""
+        surface.fill(BACKGROUND_COLOR)
+        
+        # Draw static backgrounds
+        for bg in self.backgrounds:
+            bg.draw(surface)
+        
+        # Draw ground line (only if ground image is not loaded)
+        if background_layers['ground']['image'] is None:
+            pygame.draw.line(surface, BLACK, (0, GROUND_HEIGHT), 
+                            (SCREEN_WIDTH, GROUND_HEIGHT), 2)
+        
+        # Draw welcome text with shadow effect and border
+        welcome_text = render_text_with_border(title_font, "Welcome to Forest Runner!", TEXT_COLOR, BLACK)
+        surface.blit(welcome_text, (SCREEN_WIDTH // 2 - welcome_text.get_width() // 2, 50))
+        
+        if not name_entered:
+            # Draw name input prompt with border
+            name_prompt = render_text_with_border(main_font, "Enter your name:", TEXT_COLOR, BLACK)
+            surface.blit(name_prompt, (SCREEN_WIDTH // 2 - name_prompt.get_width() // 2, 120))
             
-            # Draw high score on start screen with border
-            if self.high_score is not None and self.high_score > 0:
-                high_score = self.high_score // 10
-                formatted_high_score = f"{high_score:04d}"
-                high_score_text = render_text_with_border(score_font, f"High Score: {formatted_high_score} by {self.high_score_name}", TEXT_COLOR, BLACK)
-                screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 200))
+            # Draw input box
+            pygame.draw.rect(surface, color, input_box, 2)
+        else:
+            # Draw instructions after name is entered with border
+            instruction_text = render_text_with_border(main_font, f"Hello, {self.player_name}! Press SPACE to start", TEXT_COLOR, BLACK)
+            surface.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, 150))
+        
+        # Draw high score on start screen with border
+        if self.high_score is not None and self.high_score > 0:
+            high_score = self.high_score // 10
+            formatted_high_score = f"{high_score:04d}"
+            high_score_text = render_text_with_border(score_font, f"High Score: {formatted_high_score} by {self.high_score_name}", TEXT_COLOR, BLACK)
+            surface.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 200))
+    
+    def draw_start_screen_dynamic(self, surface, name_entered, input_box, cursor_visible):
+        """Draw the moving parts of the start screen and return the rects they cover"""
+        # Draw the character
+        dirty = [surface.blit(self.player.image, self.player.rect)]
+        
+        if not name_entered:
+            # Render the current text with border
+            txt_surface = render_text_with_border(main_font, self.player_name, TEXT_COLOR, BLACK)
+            # Blit the text
+            dirty.append(surface.blit(txt_surface, (input_box.x + 5, input_box.y + 5)))
             
-            # Update display
-            pygame.display.flip()
-            clock.tick(FPS)
+            # Draw blinking cursor if input is active
+            if cursor_visible:
+                cursor_x = input_box.x + 5 + txt_surface.get_width() - 2  # Adjust for border
+                dirty.append(pygame.draw.line(surface, TEXT_COLOR, 
+                                              (cursor_x, input_box.y + 5),
+                                              (cursor_x, input_box.y + 35), 2))
+        return dirty
     
     def load_high_score(self):
         """Load high score from file if it exists"""
@@ -520,16 +767,18 @@ class Game:
         
         # Reset game objects
         self.player = Player()
-        self.all_sprites = pygame.sprite.Group()
-        self.obstacles = pygame.sprite.Group()
-        self.all_sprites.add(self.player)
+        self.obstacles = EntityStore(obstacle_images)
         
         # Reset game state
         self.speed = 5
         self.score = 0
         self.game_over = False
         self.spawn_timer = 0
+        self.death_cause = None
         self.change_name = False
+        self.idle_screen.thaw()
+        if self.pacer is not None:
+            self.pacer.discard()  # Only presses made during this run are latency samples
         
         # Restore player name and high score
         self.player_name = player_name
@@ -544,12 +793,41 @@ class Game:
                 self.backgrounds.append(
                     Background(
                         background_layers[layer_name]['image'], 
-                        background_layers[layer_name]['speed']
+                        background_layers[layer_name]['speed'],
+                        background_layers[layer_name]['pieces']
                     )
                 )
         
         # Resume music
         audio.unpause_music()
+        
+        # Catch anything the previous run left behind
+        self.memory_checkpoint("restart")
+    
+    def memory_checkpoint(self, label):
+        """Report memory use and growth since the last checkpoint (if diagnostics are on)"""
+        if self.memory is not None:
+            self.memory.checkpoint(self.memory_sources(), label)
+    
+    def memory_sources(self):
+        """Objects holding pixel, sample and array data, by category"""
+        return {
+            'screen': [screen],
+            # Trimmed pieces that are subsurfaces share the layer image's pixels;
+            # only the converted bands own memory of their own
+            'backgrounds': [layer['image'] for layer in background_layers.values()]
+                           + [piece for bg in self.backgrounds for piece, _ in bg.pieces if piece.get_parent() is None],
+            'hero frames': [frame for frames in hero_frames.values() for frame in frames]
+                           + self.player.idle_frames + self.player.run_frames + self.player.jump_frames
+                           + [self.player.image],
+            'obstacles': obstacle_images + self.obstacles.images
+                         + [self.obstacles.x, self.obstacles.y, self.obstacles.speed,
+                            self.obstacles.width, self.obstacles.image_index],
+            'hud': [self.hud.surface] + list(self.hud.digits.values()),
+            'idle snapshot': [self.idle_screen.snapshot],
+            'capture buffers': self.capture.buffers if self.capture is not None else [],
+            'audio sounds': list(audio.sounds.values()),
+        }
     
     def run(self):
         # Show start screen first
@@ -558,9 +836,17 @@ class Game:
         # Main game loop
         running = True
         while running:
+            # On the frozen game over screen, sleep until an event arrives
+            if self.game_over and self.idle_screen.frozen:
+                events = self.idle_screen.wait(500)
+            elif self.pacer is not None:
+                events = self.pacer.events()
+            else:
+                events = pygame.event.get()
+            
             # Process events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            for event in events:
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     running = False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE and not self.game_over:
@@ -570,7 +856,8 @@ class Game:
                         self.reset_game()
                     if event.key == pygame.K_n and self.game_over:
                         # Return to start screen to change player name
-                        self.__init__()  # Reset everything
+                        self.__init__(self.capture, self.pacer, self.memory, self.backend)  # Reset everything
+                        self.memory_checkpoint("change player")
                         self.show_start_screen()  # Show start screen for name input
                     # Audio controls
                     if event.key == pygame.K_m:
@@ -582,204 +869,322 @@ class Game:
                     if event.key == pygame.K_MINUS:
                         # Decrease music volume
                         audio.set_music_volume(audio.music_volume - 0.1)
+                    # Memory diagnostics
+                    if event.key == pygame.K_F9:
+                        if self.memory is None:
+                            self.memory = MemoryDiagnostics()  # Tracing starts with the first snapshot
+                        self.memory_checkpoint("F9")
             
             if not self.game_over:
-                # Update backgrounds
-                for bg in self.backgrounds:
-                    bg.update()
-                
-                # Update sprites
-                self.all_sprites.update()
-                
-                # Spawn obstacles with randomized timing and spacing
-                self.spawn_timer += 1
-                spawn_interval = random.randint(80, 200)  # Wider range for more variability
-                
-                if self.spawn_timer > spawn_interval:
-                    # Check if there's enough distance from the last obstacle
-                    can_spawn = True
-                    min_distance = 300 + (self.speed - 5) * 20  # Base minimum distance
-                    
-                    # Check all existing obstacles to ensure proper spacing
-                    for obs in self.obstacles:
-                        # Don't spawn if any obstacle is too close to the right edge
-                        if obs.rect.x > SCREEN_WIDTH - min_distance:
-                            can_spawn = False
-                            break
-                    
-                    # Only spawn if there's enough space
-                    if can_spawn:
-                        self.spawn_obstacle()
-                        self.spawn_timer = random.randint(0, 40)  # Randomize timer reset
-                
-                # Check collisions
-                # Create a smaller hitbox for the player for more accurate collisions
-                player_hitbox = pygame.Rect(
-                    self.player.rect.x + self.player.rect.width * 0.3,  # Moved right edge in more
-                    self.player.rect.y + self.player.rect.height * 0.2,
-                    self.player.rect.width * 0.4,  # Made hitbox narrower (was 0.5)
-                    self.player.rect.height * 0.7
-                )
-                
-                # For debugging - uncomment to see hitboxes
-                # pygame.draw.rect(screen, (255, 0, 0), player_hitbox, 2)
-                
-                for obstacle in self.obstacles:
-                    # Create a custom hitbox for each obstacle type
-                    if hasattr(obstacle, 'rock_type'):
-                        if obstacle.rock_type == 'Rock1.png':
-                            # Taller, narrower hitbox for Rock1 - adjusted to match visual shape
-                            obstacle_hitbox = pygame.Rect(
-                                obstacle.rect.x + obstacle.rect.width * 0.35,
-                                obstacle.rect.y + obstacle.rect.height * 0.2,
-                                obstacle.rect.width * 0.3,  # Narrower hitbox
-                                obstacle.rect.height * 0.7
-                            )
-                        elif obstacle.rock_type == 'Rock2.png':
-                            # Medium hitbox for Rock2 - adjusted to match visual shape
-                            obstacle_hitbox = pygame.Rect(
-                                obstacle.rect.x + obstacle.rect.width * 0.3,
-                                obstacle.rect.y + obstacle.rect.height * 0.25,
-                                obstacle.rect.width * 0.4,
-                                obstacle.rect.height * 0.6
-                            )
-                        elif obstacle.rock_type == 'Rock3.png':
-                            # Wider hitbox for Rock3 - adjusted to match visual shape
-                            obstacle_hitbox = pygame.Rect(
-                                obstacle.rect.x + obstacle.rect.width * 0.25,
-                                obstacle.rect.y + obstacle.rect.height * 0.3,
-                                obstacle.rect.width * 0.5,
-                                obstacle.rect.height * 0.5
-                            )
-                        else:  # Rock4.png
-                            # Largest hitbox for Rock4 - adjusted to match visual shape
-                            obstacle_hitbox = pygame.Rect(
-                                obstacle.rect.x + obstacle.rect.width * 0.2,
-                                obstacle.rect.y + obstacle.rect.height * 0.25,
-                                obstacle.rect.width * 0.6,
-                                obstacle.rect.height * 0.6
-                            )
-                    else:
-                        # Default hitbox if rock_type is not available
-                        obstacle_hitbox = pygame.Rect(
-                            obstacle.rect.x + obstacle.rect.width * 0.25,
-                            obstacle.rect.y + obstacle.rect.height * 0.25,
-                            obstacle.rect.width * 0.5,
-                            obstacle.rect.height * 0.5
-                        )
+                self.update()
+            
+            # Nothing moves on the game over screen: compose it once and keep it frozen
+            if self.game_over:
+                if not self.idle_screen.frozen:
+                    self.last_frame = None  # Time on this screen is not frame time
                     
-                    # For debugging - uncomment to see hitboxes
-                    # pygame.draw.rect(screen, (0, 255, 0), obstacle_hitbox, 2)
+                    # Presses since the last flip never show up in gameplay: not latency samples
+                    if self.pacer is not None:
+                        self.pacer.discard()
                     
-                    # Use a more precise collision detection
-                    if player_hitbox.colliderect(obstacle_hitbox):
-                        # Calculate the actual overlap area
-                        overlap_width = min(player_hitbox.right, obstacle_hitbox.right) - max(player_hitbox.left, obstacle_hitbox.left)
-                        overlap_height = min(player_hitbox.bottom, obstacle_hitbox.bottom) - max(player_hitbox.top, obstacle_hitbox.top)
-                        overlap_area = overlap_width * overlap_height
-                        
-                        # Only count as collision if overlap area is significant
-                        if overlap_area > 50:  # Minimum overlap threshold
-                            self.game_over = True
-                            audio.pause_music()  # Pause background music
-                            audio.play_sound('game_over')  # Play game over sound
-                            break
-                
-                # Update score
-                self.score += 1
-                
-                # Update high score if needed
-                if self.high_score is None or self.score > self.high_score:
-                    self.high_score = self.score
-                    self.high_score_name = self.player_name  # Update high score holder name
-                
-                # Increase difficulty over time
-                if self.score % 500 == 0:
-                    self.speed += 0.5
-            
-            # Draw
-            screen.fill((50, 50, 80))  # Dark blue-gray background for better contrast with white text
+                    # Save high score when game is over
+                    self.save_high_score()
+                    self.idle_screen.freeze(self.draw_game_over_frame)
+                continue
             
-            # Draw backgrounds
-            for bg in self.backgrounds:
-                bg.draw(screen)
+            # Draw backgrounds, obstacles, the player and the HUD
+            self.backend.draw_frame(self)
             
-            # Draw ground line (only if ground image is not loaded)
-            if background_layers['ground']['image'] is None:
-                pygame.draw.line(screen, BLACK, (0, GROUND_HEIGHT), 
-                                (SCREEN_WIDTH, GROUND_HEIGHT), 2)
+            # Hand the finished frame to the capture writer
+            if self.capture is not None:
+                self.capture.capture(self.backend.read_frame())
             
-            # Draw sprites
-            self.all_sprites.draw(screen)
-            
-            # Draw score (divided by 10 to slow it down) with smaller font and border
-            visible_score = self.score // 10
-            
-            # Format score as 4 digits (0000)
-            formatted_score = f"{visible_score:04d}"
+            # Update display
+            self.backend.present()
+            if self.pacer is not None:
+                self.pacer.presented()
+            else:
+                clock.tick(FPS)
+            self.record_frame()
+    
+    def record_frame(self):
+        """Count a presented gameplay frame and the time since the previous one"""
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            frame_time.observe(now - self.last_frame)
+        self.last_frame = now
+        frames_presented.inc()
+    
+    def update(self, steps=1):
+        """Advance the simulation by one frame (backgrounds, player, obstacles, score).
+        
+        With steps > 1 one update covers that many frames, for headless runs that
+        trade spawn and input granularity for throughput; collisions are swept
+        along each frame of the player's path before off-screen obstacles are
+        dropped, so none are missed, and the score only counts frames survived.
+        """
+        # Update backgrounds
+        for bg in self.backgrounds:
+            bg.update(steps)
+        
+        # Update the player and move all obstacles in bulk
+        self.player.update(steps)
+        self.obstacles.move(steps)
+        
+        # Spawn obstacles with randomized timing and spacing
+        self.spawn_timer += steps
+        spawn_interval = random.randint(80, 200)  # Wider range for more variability
+        
+        if self.spawn_timer > spawn_interval:
+            # Check if there's enough distance from the last obstacle
+            can_spawn = True
+            min_distance = 300 + (self.speed - 5) * 20  # Base minimum distance
             
-            # Create a score display with border
-            score_text = render_text_with_border(score_font, f"Score: {formatted_score}", TEXT_COLOR, BLACK)
-            screen.blit(score_text, (10, 10))
+            # Don't spawn if any obstacle is too close to the right edge
+            rightmost = self.obstacles.rightmost()
+            if rightmost is not None and rightmost > SCREEN_WIDTH - min_distance:
+                can_spawn = False
             
-            # Draw high score with border (without player name during gameplay)
-            high_score = self.high_score // 10
-            formatted_high_score = f"{high_score:04d}"
-            high_score_text = render_text_with_border(score_font, f"High Score: {formatted_high_score}", TEXT_COLOR, BLACK)
-            screen.blit(high_score_text, (10, 40))  # Adjusted position due to smaller font
+            # Only spawn if there's enough space
+            if can_spawn:
+                self.spawn_obstacle()
+                self.spawn_timer = random.randint(0, 40)  # Randomize timer reset
+        
+        # Check collisions, then drop obstacles that left the screen (only now,
+        # so a rock that passed the player during this update is still checked)
+        collision = self.check_collisions()
+        self.obstacles.cull()
+        survived = steps
+        if collision is not None:
+            self.death_cause, survived = collision
+            self.game_over = True
+            audio.pause_music()  # Pause background music
+            audio.play_sound('game_over')  # Play game over sound
             
-            # Draw player name with border
-            name_text = render_text_with_border(score_font, f"Player: {self.player_name}", TEXT_COLOR, BLACK)
-            screen.blit(name_text, (SCREEN_WIDTH - name_text.get_width() - 10, 10))
+            # Score is divided by 10 to slow it down
+            collisions[self.death_cause].inc()
+            games_played.inc()
+            game_scores.observe(self.score // 10)
+            last_score.set(self.score // 10)
+            high_score_gauge.set(self.high_score // 10)
+        
+        # Update score (up to and including the frame of a collision)
+        self.score += survived
+        
+        # Update high score if needed
+        if self.high_score is None or self.score > self.high_score:
+            self.high_score = self.score
+            self.high_score_name = self.player_name  # Update high score holder name
+        
+        # Increase difficulty over time (once for every 500 points crossed)
+        self.speed += 0.5 * (self.score // 500 - (self.score - survived) // 500)
+    
+    def check_collisions(self):
+        """Return (rock type, frames until the hit) for a collision during the last update, or None.
+        
+        Hitboxes are swept over every frame the update covered instead of being
+        compared only where they ended up, so at any speed an obstacle can't
+        pass through the player between frames.
+        """
+        # Player hitboxes (smaller than the sprite) at the start and end of each frame
+        trail = [get_player_hitbox(rect) for rect in self.player.trail]
+        if len(trail) < 2:
+            trail.append(trail[0])
+        frames = len(trail) - 1
+        player_left = min(hitbox.left for hitbox in trail)
+        player_right = max(hitbox.right for hitbox in trail)
+        
+        # For debugging - uncomment to see hitboxes
+        # pygame.draw.rect(screen, (255, 0, 0), trail[-1], 2)
+        
+        # Earliest hit over all obstacles, so the score stops at the right frame
+        hit = None
+        # Obstacles spawned during this update (past the end of start_x) weren't there before
+        for i in range(len(self.obstacles.start_x)):
+            # Skip obstacles whose whole sprite stayed clear of the player horizontally
+            x = self.obstacles.x[i]
+            if x >= player_right or self.obstacles.start_x[i] + self.obstacles.width[i] <= player_left:
+                continue
             
-            # Check if death animation is complete
+            rock_type = rock_options[self.obstacles.image_index[i]]
+            rect = self.obstacles.rect(i)
             
-                
+            # Whole-pixel x at the start of every frame of the update and after the last one
+            path = self.obstacles.path(i, frames)
             
-            # Show game over screen if needed
-            if self.game_over:
-                # Create a semi-transparent overlay
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
-                screen.blit(overlay, (0, 0))
-                
-                # Game over text with border
-                game_over_text = render_text_with_border(title_font, "Game Over!", TEXT_COLOR, BLACK)
-                screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 80))
-                
-                # Restart instruction with border
-                restart_text = render_text_with_border(main_font, "Press R to restart", TEXT_COLOR, BLACK)
-                screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 10))
-                
-                # Change name instruction with border
-                name_change_text = render_text_with_border(main_font, "Press N to change player", TEXT_COLOR, BLACK)
-                screen.blit(name_change_text, (SCREEN_WIDTH // 2 - name_change_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
+            checked = frames if hit is None else hit[1] - 1
+            for frame in range(checked):
+                start, end = trail[frame], trail[frame + 1]
+                rise = end.y - start.y
                 
-                # New high score notification with border
-                if self.score == self.high_score and self.score > 0:
-                    high_score_text = render_text_with_border(main_font, "NEW HIGH SCORE!", (255, 255, 0), BLACK)  # Yellow text with black border
-                    screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, SCREEN_HEIGHT // 2 + 90))
+                # Create a custom hitbox for each obstacle type, where it is at the end of the frame
+                rect.x = path[frame + 1]
+                obstacle_hitbox = get_obstacle_hitbox(rect, rock_type)
                 
-                # Save high score when game is over
-                self.save_high_score()
+                # For debugging - uncomment to see hitboxes
+                # pygame.draw.rect(screen, (0, 255, 0), obstacle_hitbox, 2)
                 
-            # Check if death animation is complete
-            
+                # Sweep the obstacle relative to the player's hitbox at the end of the frame:
+                # it moves left by its step while the player moves by `rise`
+                step = path[frame] - path[frame + 1]
+                obstacle = (obstacle_hitbox.x + step, obstacle_hitbox.y + rise,
+                            obstacle_hitbox.width, obstacle_hitbox.height)
                 
-            
-            # Update display
-            pygame.display.flip()
-            clock.tick(FPS)
+                # Only count as collision if the overlap gets significant
+                if max_overlap_area(end, obstacle, -step, -rise) > 50:  # Minimum overlap threshold
+                    hit = (rock_type, frame + 1)
+                    break
+        
+        return hit
+    
+    def next_obstacle(self):
+        """Return (distance, rock_type) of the nearest obstacle the player has not passed yet,
+        or None if there is none. Distance is measured from the player's right edge."""
+        nearest = None
+        for i in range(len(self.obstacles)):
+            x = self.obstacles.x[i]
+            # Skip obstacles that are already behind the player
+            if x + self.obstacles.width[i] < self.player.rect.left:
+                continue
+            if nearest is None or x < self.obstacles.x[nearest]:
+                nearest = i
+        
+        if nearest is None:
+            return None
+        return (self.obstacles.x[nearest] - self.player.rect.right,
+                rock_options[self.obstacles.image_index[nearest]])
+    
+    def update_hud(self):
+        """Bring the HUD up to date; it only re-renders values that changed"""
+        # Score is divided by 10 to slow it down
+        self.hud.update(self.score // 10, self.high_score // 10, self.player_name)
+    
+    def draw_hud(self, surface):
+        """Draw score, high score and player name"""
+        self.update_hud()
+        self.hud.draw(surface)
+    
+    def draw_game_over_frame(self, surface):
+        """Draw the frozen game over frame: last world frame, HUD, overlay and texts"""
+        self.draw_world(surface)
+        self.draw_hud(surface)
+        
+        # Create a semi-transparent overlay
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
+        surface.blit(overlay, (0, 0))
+        
+        # Game over text with border
+        game_over_text = render_text_with_border(title_font, "Game Over!", TEXT_COLOR, BLACK)
+        surface.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 80))
+        
+        # Restart instruction with border
+        restart_text = render_text_with_border(main_font, "Press R to restart", TEXT_COLOR, BLACK)
+        surface.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 10))
+        
+        # Change name instruction with border
+        name_change_text = render_text_with_border(main_font, "Press N to change player", TEXT_COLOR, BLACK)
+        surface.blit(name_change_text, (SCREEN_WIDTH // 2 - name_change_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
+        
+        # New high score notification with border
+        if self.score == self.high_score and self.score > 0:
+            high_score_text = render_text_with_border(main_font, "NEW HIGH SCORE!", (255, 255, 0), BLACK)  # Yellow text with black border
+            surface.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, SCREEN_HEIGHT // 2 + 90))
+    
+    def draw_world(self, surface):
+        """Draw backgrounds, obstacles and the player with a single blits call"""
+        surface.fill(BACKGROUND_COLOR)
+        
+        items = []
+        for bg in self.backgrounds:
+            items.extend(bg.blit_items())
+        items.extend(self.obstacles.blit_items())
+        items.append((self.player.image, self.player.rect))
+        surface.blits(items, doreturn=False)
+        
+        # Draw ground line (only if ground image is not loaded)
+        if background_layers['ground']['image'] is None:
+            pygame.draw.line(surface, BLACK, (0, GROUND_HEIGHT), 
+                            (SCREEN_WIDTH, GROUND_HEIGHT), 2)
+    
+    def ground_line(self):
+        """Rect of the fallback ground line, or None when the ground image is loaded"""
+        if background_layers['ground']['image'] is None:
+            return pygame.Rect(0, GROUND_HEIGHT - 1, SCREEN_WIDTH, 2)
+        return None
     
     def spawn_obstacle(self):
-        # Create a new obstacle
-        obstacle = Obstacle(self.speed)
-        self.obstacles.add(obstacle)
-        self.all_sprites.add(obstacle)
+        # Create a new obstacle with a random rock image
+        image_index = random.randrange(len(rock_options))
+        image = obstacle_images[image_index]
+        obstacles_spawned[rock_options[image_index]].inc()
+        self.obstacles.spawn(image_index, SCREEN_WIDTH,
+                             GROUND_HEIGHT - image.get_height(), self.speed)
 
 # Run the game
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Forest Runner")
+    parser.add_argument('--capture', metavar='PATH',
+                        help="record gameplay to a raw RGB file (or a directory with --capture-format png)")
+    parser.add_argument('--capture-format', choices=['raw', 'png'], default='raw')
+    parser.add_argument('--capture-every', type=int, default=1, metavar='N', help="record every Nth frame")
+    parser.add_argument('--capture-scale', type=float, default=1.0, help="downscale factor for recorded frames")
+    parser.add_argument('--latency', action='store_true',
+                        help="measure input-to-photon latency and print a histogram on exit")
+    parser.add_argument('--late-input', action='store_true',
+                        help="sleep before sampling input instead of after the flip (implies --latency)")
+    parser.add_argument('--renderer', choices=['blit', 'texture'], default='blit',
+                        help="draw by blitting surfaces (default) or with SDL Renderer textures")
+    parser.add_argument('--render-driver', metavar='NAME',
+                        help="SDL render driver for --renderer texture (e.g. software, opengl)")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="append metrics snapshots to a rotated JSONL file")
+    parser.add_argument('--metrics-interval', type=float, default=10.0, metavar='SECONDS',
+                        help="seconds between metrics snapshots")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--memory', action='store_true',
+                        help="trace memory from startup and report growth at every restart (F9 reports any time)")
+    args = parser.parse_args()
+    
+    capture = None
+    if args.capture:
+        capture = FrameCapture(args.capture, (SCREEN_WIDTH, SCREEN_HEIGHT), args.capture_format,
+                               args.capture_every, args.capture_scale)
+    
+    pacer = None
+    if args.latency or args.late_input:
+        pacer = FramePacer(FPS, late_input=args.late_input)
+    
+    memory = MemoryDiagnostics() if args.memory else None
+    
+    backend = None
+    if args.renderer == 'texture':
+        backend = TextureBackend((SCREEN_WIDTH, SCREEN_HEIGHT), "Forest Runner", args.render_driver,
+                                 BACKGROUND_COLOR)
+    
+    exporter = JsonlExporter(args.metrics, interval=args.metrics_interval) if args.metrics else None
+    metrics_server = None
+    if args.metrics_port is not None:
+        try:
+            metrics_server = MetricsServer(args.metrics_port)
+            print(f"Serving metrics on http://127.0.0.1:{metrics_server.port}/metrics")
+        except OSError as e:
+            print(f"Could not start metrics server: {e}")
+    
+    game = Game(capture, pacer, memory, backend)
+    game.memory_checkpoint("startup")
+    try:
+        game.run()
+    finally:
+        # Also runs when the window is closed from the start screen
+        if exporter is not None:
+            print(exporter.close())
+        if metrics_server is not None:
+            metrics_server.close()
+        if capture is not None:
+            print(capture.close())
+        if pacer is not None:
+            print(pacer.report())
     pygame.quit()
     sys.exit()
@@ -0,0 +1,139 @@
+"""
+Frame Capture for Forest Runner
+Copies presented frames into a preallocated ring of buffers and writes them
+from a background thread, either to a raw memory-mapped RGB file or as a PNG
+sequence, so recording never stalls the game loop
+"""
+
+import json
+import mmap
+import os
+import queue
+import threading
+
+import pygame
+
+
+class FrameCapture:
+    def __init__(self, path, size, format='raw', every=1, scale=1.0, buffers=8):
+        """Start a capture writer.
+
+        path: output file (raw) or directory (png)
+        size: size of the frames that will be captured
+        format: 'raw' for one memory-mapped RGB24 file, 'png' for a PNG sequence
+        every: keep every Nth presented frame
+        scale: downscale factor applied when copying the frame
+        buffers: number of frames the writer may fall behind before frames are dropped
+        """
+        if format not in ('raw', 'png'):
+            raise ValueError(f"Unknown capture format: {format}")
+
+        self.path = path
+        self.format = format
+        self.every = max(1, every)
+        self.width = max(1, int(size[0] * scale))
+        self.height = max(1, int(size[1] * scale))
+        self.scaled = (self.width, self.height) != tuple(size)
+
+        # Statistics
+        self.presented = 0  # Frames offered to capture()
+        self.captured = 0   # Frames copied into a buffer
+        self.written = 0    # Frames written by the writer thread
+        self.dropped = 0    # Frames skipped because no buffer was free
+
+        # Preallocated ring: free buffers wait in `free`, filled ones in `filled`
+        self.buffers = [pygame.Surface((self.width, self.height)).convert() for _ in range(buffers)]
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+        for index in range(buffers):
+            self.free.put(index)
+
+        # Raw output state
+        self.frame_bytes = self.width * self.height * 3
+        self.file = None
+        self.map = None
+        self.capacity = 0
+
+        if format == 'png':
+            os.makedirs(path, exist_ok=True)
+        else:
+            self.file = open(path, 'w+b')
+
+        self.thread = threading.Thread(target=self.write_loop, name='frame-capture', daemon=True)
+        self.thread.start()
+
+    def capture(self, surface):
+        """Copy a presented frame into a free buffer (called from the game loop)"""
+        self.presented += 1
+        if (self.presented - 1) % self.every:
+            return
+
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            # The writer has fallen behind; never wait for it
+            self.dropped += 1
+            return
+
+        buffer = self.buffers[index]
+        if self.scaled:
+            pygame.transform.scale(surface, (self.width, self.height), buffer)
+        else:
+            buffer.blit(surface, (0, 0))
+        self.captured += 1
+        self.filled.put(index)
+
+    def write_loop(self):
+        """Writer thread: write filled buffers in order and hand them back"""
+        while True:
+            index = self.filled.get()
+            if index is None:
+                break
+            try:
+                if self.format == 'png':
+                    pygame.image.save(self.buffers[index],
+                                      os.path.join(self.path, f"frame_{self.written:06d}.png"))
+                else:
+                    self.write_raw(pygame.image.tobytes(self.buffers[index], 'RGB'))
+                self.written += 1
+            except (pygame.error, OSError) as e:
+                print(f"Could not write captured frame: {e}")
+            finally:
+                self.free.put(index)
+
+    def write_raw(self, data):
+        """Append one frame to the memory-mapped raw file, growing it as needed"""
+        if self.written >= self.capacity:
+            # Double the mapped size (at least 64 frames)
+            if self.map is not None:
+                self.map.close()
+            self.capacity = max(64, self.capacity * 2)
+            self.file.truncate(self.capacity * self.frame_bytes)
+            self.map = mmap.mmap(self.file.fileno(), self.capacity * self.frame_bytes)
+
+        offset = self.written * self.frame_bytes
+        self.map[offset:offset + self.frame_bytes] = data
+
+    def close(self):
+        """Flush pending frames, finish the output and return a summary line"""
+        self.filled.put(None)
+        self.thread.join()
+
+        if self.file is not None:
+            if self.map is not None:
+                self.map.flush()
+                self.map.close()
+            # Trim the preallocated tail and describe the layout next to the data
+            self.file.truncate(self.written * self.frame_bytes)
+            self.file.close()
+            with open(self.path + '.json', 'w') as f:
+                json.dump({
+                    'width': self.width,
+                    'height': self.height,
+                    'pixel_format': 'RGB24',
+                    'frames': self.written,
+                    'every': self.every
+                }, f)
+
+        return (f"Captured {self.written} frames to {self.path} "
+                f"({self.presented} presented, every {self.every}, {self.dropped} dropped)")
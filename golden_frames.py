@@ -0,0 +1,222 @@
+"""
+Golden Frames for Forest Runner
+Renders chosen frames of seeded headless sessions and either stores them as
+golden references or compares a new build against them, with a per-pixel
+tolerance, diff images and the render time of every frame
+
+Example:
+    python golden_frames.py record --seeds 1 2 3
+    python golden_frames.py compare --seeds 1 2 3 --tolerance 2 --diff-dir diffs
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+import headless
+from bot_harness import JumpWhenClose
+
+# Frame keys used for the non-gameplay screens of a session
+START = 'start'
+GAME_OVER = 'gameover'
+
+
+def frame_hash(surface):
+    """sha256 of a surface's RGB pixels"""
+    return hashlib.sha256(pygame.image.tobytes(surface, 'RGB')).hexdigest()
+
+
+def timed_render(draw, surface, repeat):
+    """Draw into surface `repeat` times and return the fastest time in ms"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        draw(surface)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return 1000 * best
+
+
+def session_frames(game, seed, frames, policy, backend, repeat):
+    """Play one seeded session and yield (key, frame surface, render ms) for the start
+    screen, every gameplay frame number in `frames` and the game over screen"""
+    import forest_runner
+
+    random.seed(seed)
+    game.reset_game()
+    # The HUD must not depend on this machine's high_score.txt
+    game.player_name = 'golden'
+    game.high_score = 0
+    game.high_score_name = ''
+    surface = forest_runner.screen
+
+    # Start screen with the name typed in (title, instructions and text borders)
+    input_box = pygame.Rect(forest_runner.SCREEN_WIDTH // 2 - 100, 150, 200, 40)
+    def draw_start(surface):
+        game.draw_start_screen_static(surface, False, input_box, pygame.Color('dodgerblue2'))
+        game.draw_start_screen_dynamic(surface, False, input_box, True)
+    ms = timed_render(draw_start, surface, repeat)
+    yield f"{seed}-{START}", surface.copy(), ms
+
+    wanted = set(frames)
+    for frame in range(max(frames) + 1):
+        if frame in wanted:
+            # Time the gameplay draw path of the chosen backend, including readback
+            def draw_and_read(_):
+                backend.draw_frame(game)
+                return backend.read_frame()
+            ms = timed_render(draw_and_read, None, repeat)
+            yield f"{seed}-{frame:05d}", backend.read_frame().copy(), ms
+
+        if policy(game):
+            game.player.jump()
+        game.update()
+        if game.game_over:
+            ms = timed_render(game.draw_game_over_frame, surface, repeat)
+            yield f"{seed}-{GAME_OVER}", surface.copy(), ms
+            break
+
+
+def compare_frames(golden, current, tolerance):
+    """Return (pixels differing by more than `tolerance` in any channel, largest
+    channel difference, mask of those pixels)"""
+    # |golden - current| per channel from two saturating subtractions
+    diff = golden.copy()
+    diff.blit(current, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    reverse = current.copy()
+    reverse.blit(golden, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    diff.blit(reverse, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    largest = max(pygame.image.tobytes(diff, 'RGB'), default=0)
+    # Pixels whose channels are all below the threshold count as equal
+    threshold = min(tolerance + 1, 255)
+    within = pygame.mask.from_threshold(diff, (0, 0, 0, 255), (threshold, threshold, threshold, 255))
+    within.invert()
+    return within.count(), largest, within
+
+
+def diff_image(golden, current, mismatched):
+    """Golden frame, new frame and the mismatched pixels (red over a dimmed golden frame), stacked"""
+    width, height = golden.get_size()
+    image = pygame.Surface((width, height * 3)).convert()
+    image.blit(golden, (0, 0))
+    image.blit(current, (0, height))
+
+    image.blit(golden, (0, height * 2))
+    image.fill((80, 80, 80), (0, height * 2, width, height), special_flags=pygame.BLEND_RGB_MULT)
+    image.blit(mismatched.to_surface(setcolor=(255, 0, 0, 255), unsetcolor=(0, 0, 0, 0)),
+               (0, height * 2))
+    return image
+
+
+def frame_file(key):
+    return f"frame_{key}.png"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or compare golden frames of seeded headless sessions")
+    parser.add_argument('mode', choices=['record', 'compare'])
+    parser.add_argument('--golden', default='golden', help="directory holding golden frames and manifest.json")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3], help="session seeds")
+    parser.add_argument('--frames', type=int, nargs='+', default=[0, 30, 60, 120, 180, 240, 300],
+                        help="gameplay frame numbers to render (sessions stop at game over)")
+    parser.add_argument('--distance', type=int, default=20,
+                        help="bot jump distance; the default survives every default frame (see bot_harness.py)")
+    parser.add_argument('--renderer', choices=['blit', 'texture'], default='blit',
+                        help="gameplay render backend (texture uses the software driver)")
+    parser.add_argument('--repeat', type=int, default=5, help="render each frame N times and keep the fastest time")
+    parser.add_argument('--tolerance', type=int, default=0,
+                        help="largest per-channel difference still counted as equal")
+    parser.add_argument('--max-pixels', type=int, default=0,
+                        help="pixels allowed beyond the tolerance before a frame fails")
+    parser.add_argument('--diff-dir', default='golden_diffs', help="where diff images of failed frames go")
+    args = parser.parse_args()
+
+    game = headless.create_game()
+    import forest_runner
+    if args.renderer == 'texture':
+        from render_backend import TextureBackend
+        backend = TextureBackend((forest_runner.SCREEN_WIDTH, forest_runner.SCREEN_HEIGHT), "Golden Frames",
+                                 'software', forest_runner.BACKGROUND_COLOR)
+    else:
+        backend = game.backend
+    policy = JumpWhenClose(args.distance)
+    manifest_path = os.path.join(args.golden, 'manifest.json')
+
+    if args.mode == 'record':
+        os.makedirs(args.golden, exist_ok=True)
+        manifest = {'seeds': args.seeds, 'frames': {}}
+        for seed in args.seeds:
+            for key, frame, ms in session_frames(game, seed, args.frames, policy, backend, args.repeat):
+                pygame.image.save(frame, os.path.join(args.golden, frame_file(key)))
+                manifest['frames'][key] = {'sha256': frame_hash(frame), 'render_ms': round(ms, 3),
+                                           'renderer': args.renderer}
+                print(f"{key:>14}  {ms:7.3f} ms  recorded")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Recorded {len(manifest['frames'])} frames to {args.golden}")
+        return
+
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read golden manifest {manifest_path}: {e}")
+        sys.exit(2)
+
+    failed = 0
+    compared = 0
+    golden_total = 0.0
+    current_total = 0.0
+    seen = set()
+    for seed in args.seeds:
+        for key, frame, ms in session_frames(game, seed, args.frames, policy, backend, args.repeat):
+            seen.add(key)
+            entry = manifest['frames'].get(key)
+            if entry is None:
+                print(f"{key:>14}  {ms:7.3f} ms  MISSING from golden set")
+                failed += 1
+                continue
+
+            compared += 1
+            golden_total += entry['render_ms']
+            current_total += ms
+            timing = f"{entry['render_ms']:7.3f} -> {ms:7.3f} ms"
+
+            if frame_hash(frame) == entry['sha256']:
+                print(f"{key:>14}  {timing}  identical")
+                continue
+
+            golden = pygame.image.load(os.path.join(args.golden, frame_file(key))).convert()
+            mismatched, largest, mask = compare_frames(golden, frame, args.tolerance)
+            if mismatched <= args.max_pixels:
+                print(f"{key:>14}  {timing}  within tolerance ({mismatched} px over, max diff {largest})")
+                continue
+
+            failed += 1
+            os.makedirs(args.diff_dir, exist_ok=True)
+            path = os.path.join(args.diff_dir, f"diff_{key}.png")
+            pygame.image.save(diff_image(golden, frame, mask), path)
+            print(f"{key:>14}  {timing}  FAILED: {mismatched} px over tolerance, max diff {largest} ({path})")
+
+    # Frames the golden run reached but this one did not (e.g. a session ended earlier)
+    expected = {key for key in manifest['frames'] if int(key.split('-')[0]) in args.seeds}
+    for key in sorted(expected - seen):
+        print(f"{key:>14}  not rendered by this build")
+        failed += 1
+
+    if compared:
+        print(f"Render time {golden_total:.2f} -> {current_total:.2f} ms over {compared} frames "
+              f"({golden_total / current_total:.2f}x)")
+    print(f"{compared} frames compared, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
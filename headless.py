@@ -0,0 +1,33 @@
+"""
+Headless setup for Forest Runner
+Creates silent, windowless Game instances for tools that drive the simulation
+directly (bot harness, training environment)
+"""
+
+import contextlib
+import io
+import os
+
+# Asset and high score paths are relative to the game directory
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def create_game():
+    """Import the game with dummy SDL drivers and return a new silent Game"""
+    # Video/audio drivers must be chosen before pygame is imported
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    cwd = os.getcwd()
+    os.chdir(GAME_DIR)
+    try:
+        # Keep the asset loading messages out of the tool's output
+        with contextlib.redirect_stdout(io.StringIO()):
+            import forest_runner
+            game = forest_runner.Game()
+    finally:
+        os.chdir(cwd)
+
+    # Headless runs are silent; without a mixer there is no SDL audio thread
+    forest_runner.audio.shutdown()
+    return game
@@ -0,0 +1,124 @@
+"""
+Input Latency for Forest Runner
+Frame pacing that measures input-to-photon latency and optionally samples
+input as late as possible before the frame is simulated and presented
+"""
+
+import collections
+import time
+
+import pygame
+
+
+class FramePacer:
+    def __init__(self, fps, late_input=False, bucket_ms=2):
+        """Pace the game loop at `fps`.
+
+        The pacer sleeps on the event queue instead of in Clock.tick, so every
+        KEYDOWN is timestamped when it arrives rather than when the frame
+        drains the queue. The time from arrival to the display flip that first
+        reflects it is recorded as input-to-photon latency.
+
+        With late_input the sleep happens before input is sampled, ending one
+        measured frame of work before the next flip is due, instead of after
+        the flip.
+        """
+        self.frame_time = 1.0 / fps
+        self.late_input = late_input
+        self.bucket_ms = bucket_ms
+
+        self.next_flip = time.perf_counter() + self.frame_time
+        self.work_start = time.perf_counter()
+        self.work_estimate = self.frame_time / 4  # Decaying peak of input-to-flip work
+        self.pending = []       # Events that arrived while sleeping
+        self.unpresented = []   # Arrival times of KEYDOWNs not yet on screen
+
+        # Latency statistics
+        self.histogram = collections.Counter()
+        self.samples = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def sleep_until(self, deadline):
+        """Sleep until deadline, collecting and timestamping events as they arrive"""
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            event = pygame.event.wait(max(1, int(remaining * 1000)))
+            if event.type != pygame.NOEVENT:
+                self.pending.append(event)
+                if event.type == pygame.KEYDOWN:
+                    self.unpresented.append(time.perf_counter())
+
+    def events(self):
+        """Return this frame's events (replaces pygame.event.get in the game loop)"""
+        if self.late_input:
+            # Sleep now rather than after the flip, leaving just enough time for the frame's work
+            self.sleep_until(self.next_flip - self.work_estimate)
+
+        now = time.perf_counter()
+        events = self.pending + pygame.event.get()
+        for event in events[len(self.pending):]:
+            if event.type == pygame.KEYDOWN:
+                self.unpresented.append(now)
+        self.pending = []
+        self.work_start = now
+        return events
+
+    def presented(self):
+        """Record latencies and pace the loop (call right after pygame.display.flip)"""
+        now = time.perf_counter()
+        for arrival in self.unpresented:
+            latency = now - arrival
+            self.histogram[int(latency * 1000) // self.bucket_ms] += 1
+            self.samples += 1
+            self.total += latency
+            self.worst = max(self.worst, latency)
+        self.unpresented = []
+
+        # Follow slow frames at once, recover slowly from spikes
+        work = now - self.work_start
+        self.work_estimate = max(work, self.work_estimate * 0.95)
+
+        # Schedule the next flip; start over if we fell behind (e.g. after the game over screen)
+        self.next_flip += self.frame_time
+        if self.next_flip < now:
+            self.next_flip = now + self.frame_time
+
+        if not self.late_input:
+            self.sleep_until(self.next_flip)
+
+    def discard(self):
+        """Forget key presses that will never reach a gameplay frame (call between
+        frames, e.g. when gameplay stops for the game over screen or restarts)"""
+        self.pending = []
+        self.unpresented = []
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the latency below which `fraction` of samples fall:
+        the end of the bucket holding that sample, but never above the worst sample"""
+        target = fraction * self.samples
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                return min((bucket + 1) * self.bucket_ms, 1000 * self.worst)
+        return 0
+
+    def report(self):
+        """Latency histogram as text"""
+        mode = "late input" if self.late_input else "default"
+        if not self.samples:
+            return f"Input latency ({mode}): no key presses recorded"
+
+        lines = [f"Input latency ({mode}): {self.samples} key presses, "
+                 f"mean {1000 * self.total / self.samples:.1f} ms, "
+                 f"p50 <= {self.percentile(0.5):.1f} ms, p95 <= {self.percentile(0.95):.1f} ms, "
+                 f"max {1000 * self.worst:.1f} ms"]
+        peak = max(self.histogram.values())
+        for bucket in sorted(self.histogram):
+            count = self.histogram[bucket]
+            low = bucket * self.bucket_ms
+            lines.append(f"  {low:4d}-{low + self.bucket_ms:<4d} ms {count:6d} {'#' * max(1, 40 * count // peak)}")
+        return "\n".join(lines)
@@ -0,0 +1,89 @@
+"""
+Memory Diagnostics for Forest Runner
+Reports bytes held per asset category and takes tracemalloc snapshots that are
+diffed against the previous checkpoint, so growth between restarts is caught
+"""
+
+import array
+import tracemalloc
+
+import pygame
+
+
+def object_bytes(obj):
+    """Approximate bytes of pixel/sample/array data behind an object"""
+    if isinstance(obj, pygame.Surface):
+        return obj.get_pitch() * obj.get_height()
+    if isinstance(obj, array.array):
+        return obj.itemsize * len(obj)
+    if isinstance(obj, pygame.mixer.Sound):
+        mixer = pygame.mixer.get_init()
+        if mixer is None:
+            return 0
+        frequency, sample_format, channels = mixer
+        return int(obj.get_length() * frequency * channels * abs(sample_format) // 8)
+    return 0
+
+
+class MemoryDiagnostics:
+    def __init__(self, top=10):
+        """Start tracing Python allocations; `top` limits the lines in each snapshot diff"""
+        self.top = top
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.previous = None  # (label, usage, snapshot) of the last checkpoint
+
+    def usage(self, sources):
+        """Return {category: (objects, bytes)} for a {category: [objects]} mapping.
+
+        Objects shared between holders or categories are counted once, under the
+        first category that lists them.
+        """
+        seen = set()
+        usage = {}
+        for category, objects in sources.items():
+            count = 0
+            total = 0
+            for obj in objects:
+                if obj is None or id(obj) in seen:
+                    continue
+                seen.add(id(obj))
+                count += 1
+                total += object_bytes(obj)
+            usage[category] = (count, total)
+        return usage
+
+    def checkpoint(self, sources, label):
+        """Report asset memory and the Python allocation growth since the last checkpoint"""
+        usage = self.usage(sources)
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ])
+
+        lines = [f"Memory checkpoint: {label}"]
+        previous_usage = self.previous[1] if self.previous else {}
+        for category, (count, total) in usage.items():
+            line = f"  {category:<16} {count:5d} objects {total / 1024:10.1f} KiB"
+            if category in previous_usage:
+                growth = total - previous_usage[category][1]
+                if growth:
+                    line += f"  ({growth / 1024:+.1f} KiB)"
+            lines.append(line)
+        lines.append(f"  {'total':<16} {sum(c for c, _ in usage.values()):5d} objects "
+                     f"{sum(t for _, t in usage.values()) / 1024:10.1f} KiB")
+
+        traced, peak = tracemalloc.get_traced_memory()
+        lines.append(f"  python heap: {traced / 1024:.1f} KiB traced, {peak / 1024:.1f} KiB peak")
+
+        if self.previous is not None:
+            growth = [stat for stat in snapshot.compare_to(self.previous[2], 'lineno') if stat.size_diff > 0]
+            if growth:
+                lines.append(f"  growth since {self.previous[0]}:")
+                for stat in growth[:self.top]:
+                    lines.append(f"    {stat}")
+
+        self.previous = (label, usage, snapshot)
+        report = "\n".join(lines)
+        print(report)
+        return report
@@ -0,0 +1,233 @@
+"""
+Metrics for Forest Runner
+A small registry of counters, gauges and fixed-bucket histograms. Instruments
+are plain attribute updates, so recording on the hot path costs well under a
+microsecond. Snapshots are exported as rotated JSONL files from a background
+thread and optionally served as Prometheus text on a localhost-only HTTP port.
+"""
+
+import bisect
+import http.server
+import json
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+
+
+class Counter:
+    """Monotonically increasing value"""
+    type = 'counter'
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def sample(self):
+        return {'value': self.value}
+
+
+class Gauge:
+    """Value that can go up and down"""
+    type = 'gauge'
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def sample(self):
+        return {'value': self.value}
+
+
+class Histogram:
+    """Observations counted into fixed buckets (upper bounds; +Inf is added)"""
+    type = 'histogram'
+
+    def __init__(self, buckets):
+        self.bounds = sorted(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def sample(self):
+        """Cumulative bucket counts keyed by their upper bound, like Prometheus"""
+        counts = list(self.counts)
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.bounds + [math.inf], counts):
+            total += count
+            buckets[format_bound(bound)] = total
+        return {'buckets': buckets, 'sum': self.sum, 'count': total}
+
+
+def format_bound(bound):
+    return '+Inf' if bound == math.inf else repr(float(bound))
+
+
+class Registry:
+    def __init__(self):
+        self.families = {}  # name -> (type, help, {label items: instrument})
+
+    def instrument(self, cls, name, help, labels, *args):
+        family = self.families.setdefault(name, (cls.type, help, {}))
+        if family[0] != cls.type:
+            raise ValueError(f"Metric {name} is already registered as a {family[0]}")
+        key = tuple(sorted((labels or {}).items()))
+        series = family[2]
+        if key not in series:
+            series[key] = cls(*args)
+        return series[key]
+
+    def counter(self, name, help, labels=None):
+        """Get or create the counter for a name and label set"""
+        return self.instrument(Counter, name, help, labels)
+
+    def gauge(self, name, help, labels=None):
+        """Get or create the gauge for a name and label set"""
+        return self.instrument(Gauge, name, help, labels)
+
+    def histogram(self, name, help, buckets, labels=None):
+        """Get or create the histogram for a name and label set"""
+        return self.instrument(Histogram, name, help, labels, buckets)
+
+    def snapshot(self):
+        """List of {name, type, labels, ...sample} dicts for every series"""
+        samples = []
+        for name, (kind, _, series) in list(self.families.items()):
+            for key, instrument in list(series.items()):
+                sample = {'name': name, 'type': kind, 'labels': dict(key)}
+                sample.update(instrument.sample())
+                samples.append(sample)
+        return samples
+
+    def prometheus_text(self):
+        """All series in the Prometheus text exposition format"""
+        lines = []
+        for name, (kind, help, series) in list(self.families.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, instrument in list(series.items()):
+                sample = instrument.sample()
+                if kind == 'histogram':
+                    for bound, count in sample['buckets'].items():
+                        lines.append(f"{name}_bucket{format_labels(key + (('le', bound),))} {count}")
+                    lines.append(f"{name}_sum{format_labels(key)} {sample['sum']}")
+                    lines.append(f"{name}_count{format_labels(key)} {sample['count']}")
+                else:
+                    lines.append(f"{name}{format_labels(key)} {sample['value']}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(items):
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in items)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(items, escaped)) + '}'
+
+
+# Registry shared by the game and its modules
+registry = Registry()
+
+
+class JsonlExporter:
+    def __init__(self, path, registry=registry, interval=10.0, max_bytes=1024 * 1024, backups=5):
+        """Append a registry snapshot to `path` every `interval` seconds from a background thread.
+
+        When the file would grow past max_bytes it is rotated to path.1, path.1
+        to path.2 and so on, keeping `backups` old files. Every line carries the
+        host and a per-process session id so files from several machines can be
+        merged.
+        """
+        self.path = path
+        self.registry = registry
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.host = socket.gethostname()
+        self.session = uuid.uuid4().hex
+        self.lines = 0
+
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.export_loop, name='metrics-export', daemon=True)
+        self.thread.start()
+
+    def export_loop(self):
+        while not self.stopped.wait(self.interval):
+            self.export()
+
+    def export(self):
+        """Write one snapshot line now"""
+        line = json.dumps({
+            'time': time.time(),
+            'host': self.host,
+            'session': self.session,
+            'metrics': self.registry.snapshot()
+        }) + "\n"
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                self.rotate()
+            with open(self.path, 'a') as f:
+                f.write(line)
+            self.lines += 1
+        except OSError as e:
+            print(f"Could not write metrics: {e}")
+
+    def rotate(self):
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest"""
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Stop the thread, write a final snapshot and return a summary line"""
+        self.stopped.set()
+        self.thread.join()
+        self.export()
+        return f"Wrote {self.lines} metrics snapshots to {self.path}"
+
+
+class MetricsServer:
+    def __init__(self, port, registry=registry):
+        """Serve the registry as Prometheus text on http://127.0.0.1:<port>/metrics"""
+        self.registry = registry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path not in ('/metrics', '/'):
+                    handler.send_error(404)
+                    return
+                body = self.registry.prometheus_text().encode()
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass  # Keep scrapes out of the game's console output
+
+        # Bound to the loopback interface only: metrics are never reachable from other machines
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-http', daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,128 @@
+"""
+Render Backends for Forest Runner
+BlitBackend (the default) draws by blitting surfaces onto the display surface.
+TextureBackend uploads static assets to pygame._sdl2 textures once and draws
+with an SDL Renderer; scrolling layers are drawn with source-rect offsets.
+It works with SDL's software renderer, so it also runs headless.
+"""
+
+import weakref
+
+import pygame
+
+
+class BlitBackend:
+    name = 'blit'
+
+    def __init__(self, surface):
+        self.surface = surface
+
+    def draw_frame(self, game):
+        """Draw backgrounds, obstacles, the player and the HUD"""
+        game.draw_world(self.surface)
+        game.draw_hud(self.surface)
+
+    def read_frame(self):
+        """Surface holding the frame just drawn (for capture)"""
+        return self.surface
+
+    def present(self):
+        pygame.display.flip()
+
+    def present_surface(self, surface, rects=None):
+        """Show a frame drawn into the display surface (whole, or only `rects`)"""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+class TextureBackend:
+    name = 'texture'
+
+    def __init__(self, size, title, driver=None, clear_color=(0, 0, 0)):
+        """Open a Renderer window; `driver` names an SDL render driver (e.g. 'software')"""
+        from pygame._sdl2 import video
+
+        self.video = video
+        self.size = size
+        self.clear_color = (*clear_color, 255)  # Renderer colors are RGBA
+
+        # SDL only allows a Renderer on a window without a surface. The display
+        # module's window keeps its surface (assets were converted for it), so
+        # it is hidden and the game draws to a window of its own.
+        pygame.display.set_mode(size, pygame.HIDDEN)
+        self.window = video.Window(title, size)
+
+        index = -1
+        if driver is not None:
+            names = [info.name for info in video.get_drivers()]
+            if driver not in names:
+                raise ValueError(f"Unknown render driver {driver!r}, available: {', '.join(names)}")
+            index = names.index(driver)
+        self.renderer = video.Renderer(self.window, index=index)
+
+        # Textures are uploaded once per surface and dropped with it
+        self.textures = weakref.WeakKeyDictionary()
+
+        # Streaming texture for frames drawn into a surface (start and game over screens)
+        self.frame_texture = video.Texture(self.renderer, size, streaming=True)
+        self.frame_surface = pygame.Surface(size).convert()  # Capture readback target
+
+    def texture(self, surface):
+        """Texture for a surface, uploaded on first use"""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def draw_background(self, background):
+        """Draw a scrolling layer from its piece textures, using a source-rect
+        offset for the on-screen part of each copy"""
+        for piece, (pos, y) in background.blit_items():
+            texture = self.texture(piece)
+            width, height = piece.get_size()
+
+            # Same truncation as blitting at a float position
+            x = int(pos)
+            left = max(x, 0)
+            right = min(x + width, self.size[0])
+            if right > left:
+                texture.draw(srcrect=(left - x, 0, right - left, height),
+                             dstrect=(left, y, right - left, height))
+
+    def draw_frame(self, game):
+        """Draw backgrounds, obstacles, the player and the HUD"""
+        renderer = self.renderer
+        renderer.draw_color = self.clear_color
+        renderer.clear()
+
+        for background in game.backgrounds:
+            self.draw_background(background)
+
+        line = game.ground_line()
+        if line is not None:
+            renderer.draw_color = (0, 0, 0, 255)
+            renderer.fill_rect(line)
+
+        for image, pos in game.obstacles.blit_items():
+            self.texture(image).draw(dstrect=(int(pos[0]), int(pos[1])))
+        self.texture(game.player.image).draw(dstrect=game.player.rect.topleft)
+
+        game.update_hud()
+        for image, pos in game.hud.layout():
+            self.texture(image).draw(dstrect=pos)
+
+    def read_frame(self):
+        """Read the frame just drawn back into a surface (slow; for capture)"""
+        return self.renderer.to_surface(self.frame_surface)
+
+    def present(self):
+        self.renderer.present()
+
+    def present_surface(self, surface, rects=None):
+        """Upload a frame drawn into a surface and show it"""
+        self.frame_texture.update(surface)
+        self.frame_texture.draw()
+        self.renderer.present()